@@ -1,5 +1,5 @@
 import os
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -10,9 +10,14 @@ class Settings(BaseSettings):
     environment: str = os.getenv("ENVIRONMENT", "development")
     admin_api_key: str = os.getenv("ADMIN_API_KEY", "")
     enable_debug_endpoints: bool = os.getenv("ENABLE_DEBUG_ENDPOINTS", "false").lower() == "true"
+    # Postgres connection pool (DB_POOL_SIZE etc. in the environment)
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    # Set when connecting through PgBouncer in transaction mode so connections aren't pooled twice
+    db_use_null_pool: bool = False
 
-    class Config:
-        env_file = ".env"
+    model_config = SettingsConfigDict(env_file=".env")
 
     @property
     def is_postgres(self) -> bool:
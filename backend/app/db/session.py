@@ -1,15 +1,36 @@
+"""
+Database engine and session factory.
+
+On Postgres the engine keeps a QueuePool sized by DB_POOL_SIZE, DB_MAX_OVERFLOW and
+DB_POOL_TIMEOUT (20, 10 and 30s by default), which covers FastAPI's threadpool
+without requests queueing for a connection. Behind PgBouncer in transaction mode,
+set DB_USE_NULL_POOL=true so each checkout goes straight to PgBouncer instead of
+holding connections in a second pool.
+"""
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
 from ..core.config import settings
 
 # Create engine using settings from config
 # Only use check_same_thread for SQLite, not PostgreSQL
-if settings.is_postgres:
-    engine = create_engine(settings.database_url)
+if settings.is_postgres and settings.db_use_null_pool:
+    engine = create_engine(settings.database_url, poolclass=NullPool)
+elif settings.is_postgres:
+    engine = create_engine(
+        settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        # Hosted Postgres drops idle connections; check and recycle them instead of failing a request
+        pool_pre_ping=True,
+        pool_recycle=1800,
+    )
 else:
     engine = create_engine(settings.database_url, connect_args={"check_same_thread": False})
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay usable after commit without a reload query per attribute access
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import threading
 from contextlib import asynccontextmanager
@@ -6,6 +7,7 @@ from logging import getLogger
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 
 # Load environment variables from .env file
@@ -119,16 +121,39 @@ async def lifespan(app: FastAPI):
                     ))
                 except Exception:
                     pass
+            # create_all doesn't add indexes to existing tables
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_analysis_cache_expires_at ON analysis_cache (expires_at)"
+            ))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_matchups_daily_set_order ON matchups (daily_set_id, order_index)"
+            ))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_user_choices_matchup_id ON user_choices (matchup_id)"
+            ))
             conn.commit()
 
+    try:
+        analysis.warm_clients()
+    except Exception:
+        logger.exception("Failed to initialize AI provider clients")
+
     startup_thread = threading.Thread(target=_run_heavy_startup, args=(app,), daemon=True)
     startup_thread.start()
 
+    sweep_task = asyncio.create_task(analysis.sweep_expired_cache_loop())
+
     yield
 
+    sweep_task.cancel()
+
 
 app = FastAPI(title="Who's Yur GOAT API", lifespan=lifespan)
 
+# Game payloads are mostly repeated stat keys and numbers and compress well.
+# Server-sent event streams are left uncompressed by the middleware.
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=_get_cors_origins(),
@@ -9,6 +9,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     UniqueConstraint,
     Text,
 )
@@ -69,7 +70,7 @@ class DailySet(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     players = relationship("DailySetPlayer", back_populates="daily_set")
-    matchups = relationship("Matchup", back_populates="daily_set")
+    matchups = relationship("Matchup", back_populates="daily_set", order_by="Matchup.order_index")
 
 
 class DailySetPlayer(Base):
@@ -113,6 +114,11 @@ class Matchup(Base):
 
     user_choices = relationship("UserChoice", back_populates="matchup")
 
+    __table_args__ = (
+        # Loads a set's matchups already in play order
+        Index("ix_matchups_daily_set_order", "daily_set_id", "order_index"),
+    )
+
 
 class User(Base):
     __tablename__ = "users"
@@ -139,7 +145,7 @@ class UserChoice(Base):
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Nullable for anonymous users
     session_id = Column(String, nullable=True)  # For anonymous users
-    matchup_id = Column(Integer, ForeignKey("matchups.id"), nullable=False)
+    matchup_id = Column(Integer, ForeignKey("matchups.id"), nullable=False, index=True)
 
     winner_player_id = Column(String, ForeignKey("players.id"), nullable=False)
     rationale_tag = Column(String, nullable=True)  # "stats", "legacy", "that boy nice", etc.
@@ -192,6 +198,8 @@ class Submission(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    daily_set = relationship("DailySet")
+
 
 class AnalysisFeedback(Base):
     __tablename__ = "analysis_feedback"
@@ -333,4 +341,4 @@ class AnalysisCache(Base):
     input_hash = Column(String(64), nullable=False)  # SHA256 of rankings data
 
     created_at = Column(DateTime, default=datetime.utcnow)
-    expires_at = Column(DateTime, nullable=True)  # Optional expiration
+    expires_at = Column(DateTime, nullable=True, index=True)  # Optional expiration
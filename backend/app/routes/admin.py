@@ -6,6 +6,8 @@ from ..services.player_loader import load_players_from_csv, get_top_players_by_r
 from ..services.scheduler import GameScheduler
 from ..services.batch_scheduler import BatchScheduler
 from ..core.config import settings
+from .game import clear_game_response_cache
+from .voting import clear_voting_cache
 import os
 
 
@@ -46,6 +48,8 @@ def load_players_endpoint(db: Session = Depends(get_db)):
     
     try:
         players = load_players_from_csv(db, csv_path)
+        clear_game_response_cache()
+        clear_voting_cache()
         return {
             "message": f"Successfully loaded {len(players)} players from {csv_path}",
             "players_loaded": len(players)
@@ -272,6 +276,8 @@ def reset_schedule(db: Session = Depends(get_db)):
     db.query(DailySet).delete()
     
     db.commit()
+    clear_game_response_cache()
+    clear_voting_cache()
     
     return {"message": "Schedule reset successfully"}
 
@@ -319,6 +325,8 @@ def full_reset_and_regenerate(db: Session = Depends(get_db), top_n: int = 30, da
         db.query(DailySetPlayer).delete()
         db.query(DailySet).delete()
         db.commit()
+        clear_game_response_cache()
+        clear_voting_cache()
         results["steps"].append("Cleared old schedule")
     except Exception as e:
         db.rollback()
@@ -443,6 +451,8 @@ def full_reset_and_regenerate(db: Session = Depends(get_db), top_n: int = 30, da
             days_created += 1
         
         db.commit()
+        clear_game_response_cache()
+        clear_voting_cache()
         
         # Report appearances by tier
         top_10_summary = {}
@@ -365,7 +365,7 @@ async def list_presets():
 
 
 @router.post("/start", response_model=StartRankingResponse)
-async def start_ranking(
+def start_ranking(
     request: StartRankingRequest,
     session_id: Optional[str] = Depends(get_session_id),
     db: Session = Depends(get_db)
@@ -488,7 +488,7 @@ async def start_ranking(
 
 
 @router.put("/{ranking_id}/vote", response_model=VoteResponse)
-async def submit_vote(
+def submit_vote(
     ranking_id: int,
     request: VoteRequest,
     session_id: Optional[str] = Depends(get_session_id),
@@ -618,7 +618,7 @@ async def submit_vote(
 
 
 @router.get("/{ranking_id}", response_model=GetRankingResponse)
-async def get_ranking(
+def get_ranking(
     ranking_id: int,
     session_id: Optional[str] = Depends(get_session_id),
     db: Session = Depends(get_db)
@@ -648,7 +648,7 @@ async def get_ranking(
 
 
 @router.post("/{ranking_id}/complete", response_model=CompleteRankingResponse)
-async def complete_ranking(
+def complete_ranking(
     ranking_id: int,
     request: CompleteRankingRequest,
     session_id: Optional[str] = Depends(get_session_id),
@@ -694,7 +694,7 @@ async def complete_ranking(
 
 
 @router.get("/share/{share_slug}", response_model=GetRankingResponse)
-async def get_shared_ranking(
+def get_shared_ranking(
     share_slug: str,
     db: Session = Depends(get_db)
 ):
@@ -725,7 +725,7 @@ async def get_shared_ranking(
 # ============ Custom Lists Endpoints ============
 
 @router.post("/lists/create", response_model=CreateListResponse)
-async def create_custom_list(
+def create_custom_list(
     request: CreateListRequest,
     session_id: Optional[str] = Depends(get_session_id),
     db: Session = Depends(get_db)
@@ -772,7 +772,7 @@ async def create_custom_list(
 
 
 @router.get("/lists/{share_code}", response_model=GetListResponse)
-async def get_custom_list(
+def get_custom_list(
     share_code: str,
     db: Session = Depends(get_db)
 ):
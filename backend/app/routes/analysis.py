@@ -2,30 +2,81 @@
 AI Analysis endpoints with support for both OpenAI and Claude.
 Includes caching to reduce API costs.
 """
+import asyncio
 import os
 import hashlib
+import heapq
 import json
 from datetime import datetime, timedelta
-from typing import Optional, Literal
+from functools import lru_cache
+from typing import AsyncIterator, Optional, Literal, Sequence, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from sqlalchemy import delete, or_
 from sqlalchemy.orm import Session
 
-from ..db.session import get_db
+from ..db.session import SessionLocal, get_db
 from .. import models
 
 router = APIRouter()
 
+# Only the players with the biggest ranking differences are sent to the model
+PROMPT_RANKINGS_LIMIT = 15
+
+# How long generated analyses are cached
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# After a provider failure the data-driven fallback is cached briefly under the
+# same key, so an outage or rate limit costs one upstream call per window.
+FALLBACK_TTL_SECONDS = 60
+RATE_LIMITED_TTL_SECONDS = 30
+FAILURE_PROVIDERS = ("fallback", "error:ratelimit")
+
+# Expired rows are ignored on read and removed in bulk on this interval
+CACHE_SWEEP_INTERVAL_SECONDS = 10 * 60
+
+# Which providers have API keys; read once (main.py loads .env before importing routes)
+PROVIDER_AVAILABILITY = {
+    "openai": bool(os.getenv("OPENAI_API_KEY")),
+    "claude": bool(os.getenv("ANTHROPIC_API_KEY")),
+}
+
+# Generations currently running, keyed by provider + cache key
+_inflight: dict[str, asyncio.Task] = {}
+
+# Cache writes started by shared generations; held so they aren't garbage collected
+_pending_saves: set[asyncio.Task] = set()
+
 
 # ============ Request/Response Models ============
 
+class RankingEntry(BaseModel):
+    """One player's row in the rankings comparison sent by the frontend."""
+    # Frozen so a tuple of entries can key the prompt cache
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    name: str
+    rank: Optional[int] = None
+    ringerRank: Optional[int] = None
+    h2hRank: Optional[int] = None
+    diff: Optional[Union[int, float]] = None
+    stats_summary: Optional[str] = None
+
+
 class AnalysisRequest(BaseModel):
-    rankings: list[dict]
+    rankings: list[RankingEntry] = Field(max_length=1000)
     comparison_type: Optional[str] = None  # 'h2h_vs_elo', 'h2h_vs_ringer', 'elo_vs_ringer'
     analysis_style: Optional[Literal["concise", "detailed", "hot_take"]] = "concise"
     provider: Optional[Literal["auto", "openai", "claude"]] = "auto"
 
+    @field_validator("rankings")
+    @classmethod
+    def keep_biggest_differences(cls, rankings: list[RankingEntry]) -> list[RankingEntry]:
+        """Trim to the entries that are actually used, so unused tail players don't affect the cache key."""
+        return heapq.nlargest(PROMPT_RANKINGS_LIMIT, rankings, key=lambda r: abs(r.diff or 0))
+
 
 class AnalysisResponse(BaseModel):
     analysis: str
@@ -38,73 +89,26 @@ class FeedbackCreate(BaseModel):
     rating: int
 
 
-# ============ Helper Functions ============
-
-def get_cache_key(rankings: list[dict], comparison_type: str, style: str) -> str:
-    """Generate a cache key from the analysis parameters."""
-    # Create a deterministic string from rankings
-    rankings_str = json.dumps(
-        [{"name": r.get("name"), "rank": r.get("rank"), "diff": r.get("diff")}
-         for r in rankings[:15]],
-        sort_keys=True
-    )
-    key_str = f"{rankings_str}:{comparison_type}:{style}"
-    return hashlib.sha256(key_str.encode()).hexdigest()[:32]
-
-
-def get_cached_analysis(cache_key: str, provider: str, db: Session) -> Optional[str]:
-    """Check for cached analysis."""
-    cache = db.query(models.AnalysisCache).filter(
-        models.AnalysisCache.cache_key == cache_key,
-        models.AnalysisCache.provider == provider
-    ).first()
-
-    if cache:
-        # Check if expired (24 hours)
-        if cache.expires_at and cache.expires_at < datetime.utcnow():
-            db.delete(cache)
-            db.commit()
-            return None
-        return cache.analysis_text
-    return None
-
-
-def save_cached_analysis(cache_key: str, provider: str, analysis: str, db: Session):
-    """Save analysis to cache."""
-    cache = models.AnalysisCache(
-        cache_key=cache_key,
-        provider=provider,
-        analysis_text=analysis,
-        input_hash=cache_key,
-        expires_at=datetime.utcnow() + timedelta(hours=24)
-    )
-    db.add(cache)
-    try:
-        db.commit()
-    except Exception:
-        db.rollback()
-
+# ============ Prompt Templates ============
 
-def build_prompt(rankings: list[dict], comparison_type: str, style: str) -> tuple[str, str]:
-    """Build the analysis prompt based on style."""
+# Context sentence for each comparison type
+COMPARISON_CONTEXT = {
+    "h2h_vs_elo": "comparing simulated Head-to-Head voting results against our internal ELO model",
+    "h2h_vs_ringer": "comparing simulated Head-to-Head voting results against The Ringer's Top 100",
+    "elo_vs_ringer": "comparing our internal ELO model against The Ringer's Top 100",
+}
+DEFAULT_COMPARISON_CONTEXT = "comparing different ranking methodologies"
 
-    # Build context based on comparison type
-    comparison_context = {
-        "h2h_vs_elo": "comparing simulated Head-to-Head voting results against our internal ELO model",
-        "h2h_vs_ringer": "comparing simulated Head-to-Head voting results against The Ringer's Top 100",
-        "elo_vs_ringer": "comparing our internal ELO model against The Ringer's Top 100",
-    }.get(comparison_type, "comparing different ranking methodologies")
+# Style-specific personas
+STYLE_PERSONAS = {
+    "concise": "You are a concise basketball analyst for the People's Champ ranking system. Keep responses short and punchy. Maximum 4 bullet points, one sentence each. Focus on interesting insights about player valuations.",
+    "detailed": "You are a thoughtful basketball analyst providing in-depth analysis of player rankings. Provide nuanced insights about why certain players are valued differently across ranking systems. Include context about playing styles, team situations, and statistical profiles.",
+    "hot_take": "You are a bold, entertaining basketball analyst known for spicy takes. Be provocative but back it up with data. Challenge conventional wisdom. Make it fun and engaging while still being insightful."
+}
 
-    # Style-specific system prompts
-    system_prompts = {
-        "concise": "You are a concise basketball analyst for the People's Champ ranking system. Keep responses short and punchy. Maximum 4 bullet points, one sentence each. Focus on interesting insights about player valuations.",
-        "detailed": "You are a thoughtful basketball analyst providing in-depth analysis of player rankings. Provide nuanced insights about why certain players are valued differently across ranking systems. Include context about playing styles, team situations, and statistical profiles.",
-        "hot_take": "You are a bold, entertaining basketball analyst known for spicy takes. Be provocative but back it up with data. Challenge conventional wisdom. Make it fun and engaging while still being insightful."
-    }
-
-    # Style-specific formats
-    formats = {
-        "concise": """Respond ONLY in this exact format:
+# Style-specific formats
+STYLE_FORMATS = {
+    "concise": """Respond ONLY in this exact format:
 
 • Biggest overvaluation: [Player Name] - [One short reason]
 • Biggest undervaluation: [Player Name] - [One short reason]
@@ -113,7 +117,7 @@ def build_prompt(rankings: list[dict], comparison_type: str, style: str) -> tupl
 
 Keep each bullet to ONE sentence maximum.""",
 
-        "detailed": """Provide a detailed analysis covering:
+    "detailed": """Provide a detailed analysis covering:
 
 1. **Most Overvalued Player**: Who and why (2-3 sentences)
 2. **Most Undervalued Player**: Who and why (2-3 sentences)
@@ -121,7 +125,7 @@ Keep each bullet to ONE sentence maximum.""",
 4. **Surprising Agreements**: Where do the rankings align unexpectedly? (1-2 sentences)
 5. **Key Takeaway**: What should fans understand from this comparison? (1-2 sentences)""",
 
-        "hot_take": """Give us your hottest takes in this format:
+    "hot_take": """Give us your hottest takes in this format:
 
 🔥 **OVERRATED ALERT**: [Player] - [Spicy reason why they're overrated]
 💎 **SLEEPING ON**: [Player] - [Why this player deserves more respect]
@@ -129,98 +133,477 @@ Keep each bullet to ONE sentence maximum.""",
 🎯 **BOLD PREDICTION**: [Based on this data, what should we expect?]
 
 Be bold. Be entertaining. Back it up with the numbers."""
-    }
+}
 
-    system_prompt = system_prompts.get(style, system_prompts["concise"])
-    format_instructions = formats.get(style, formats["concise"])
+# Everything that only depends on the style goes in the system prompt so it
+# forms an identical, provider-cacheable prefix; the varying data goes last.
+SYSTEM_PROMPTS = {
+    style: f"{STYLE_PERSONAS[style]}\n\n{STYLE_FORMATS[style]}" for style in STYLE_PERSONAS
+}
 
-    user_prompt = f"""Analyze this basketball ranking data {comparison_context}. {format_instructions}
+# Fixed opening of the user prompt for each comparison type
+USER_PROMPT_HEADERS = {
+    comparison_type: f"Analyze this basketball ranking data {context}.\n\nData (showing players with biggest ranking differences):\n"
+    for comparison_type, context in COMPARISON_CONTEXT.items()
+}
+DEFAULT_USER_PROMPT_HEADER = (
+    f"Analyze this basketball ranking data {DEFAULT_COMPARISON_CONTEXT}.\n\n"
+    "Data (showing players with biggest ranking differences):\n"
+)
 
-Data (showing players with biggest ranking differences):
-"""
 
-    for p in rankings[:15]:
-        h2h_rank = p.get('h2hRank', 'N/A')
-        stats = p.get('stats_summary', 'N/A')
-        user_prompt += f"\n- {p['name']}: ELO #{p.get('rank', 'N/A')}, Ringer #{p.get('ringerRank', 'N/A')}, H2H #{h2h_rank} (Diff: {p.get('diff', 'N/A')}). Stats: {stats}"
+# ============ Helper Functions ============
+
+MAX_BATCH_SIZE = 5
+
+# Short fixed-format styles go to the cheaper, faster models; only the
+# long-form analysis needs the large ones.
+OPENAI_MODELS = {
+    "concise": "gpt-4o-mini",
+    "detailed": "gpt-4o",
+    "hot_take": "gpt-4o-mini",
+}
+CLAUDE_MODELS = {
+    "concise": "claude-3-5-haiku-20241022",
+    "detailed": "claude-sonnet-4-20250514",
+    "hot_take": "claude-3-5-haiku-20241022",
+}
+
+BATCH_SYSTEM_PROMPT = (
+    "You are a basketball analyst for the People's Champ ranking system. "
+    "You will receive several independent analysis tasks, each with its own persona and format. "
+    "Answer every task independently, following that task's instructions exactly."
+)
+
+
+def resolve_provider(requested_provider: str, openai_available: bool, claude_available: bool) -> Optional[str]:
+    """Pick the provider to use for a request, or None if none is configured."""
+    if requested_provider == "auto":
+        # Prefer Claude if available, fall back to OpenAI
+        return "claude" if claude_available else ("openai" if openai_available else None)
+    if requested_provider == "claude":
+        return "claude" if claude_available else None
+    if requested_provider == "openai":
+        return "openai" if openai_available else None
+    return None
+
+
+def get_cache_key(players: tuple[RankingEntry, ...], comparison_type: str, style: str) -> str:
+    """Generate a cache key from the analysis parameters."""
+    # Compact deterministic representation of the fields that shape the prompt
+    key_str = "|".join(
+        f"{p.name}:{p.rank}:{p.ringerRank}:{p.h2hRank}:{p.diff}:{p.stats_summary}" for p in players
+    )
+    # Include the models so switching a style's model doesn't serve the old model's text
+    key_str = f"{key_str}|{comparison_type}|{style}|{OPENAI_MODELS.get(style)}|{CLAUDE_MODELS.get(style)}"
+    return hashlib.blake2b(key_str.encode(), digest_size=16).hexdigest()
+
+
+def get_cached_analysis(cache_key: str, db: Session) -> Optional[tuple[str, str]]:
+    """Check for a cached analysis; returns (provider, text) of the live row for the key."""
+    # cache_key is unique, so whichever provider answered is served, including a
+    # short-lived failure marker. Expired rows are filtered out rather than deleted on read.
+    row = db.query(models.AnalysisCache.provider, models.AnalysisCache.analysis_text).filter(
+        models.AnalysisCache.cache_key == cache_key,
+        or_(
+            models.AnalysisCache.expires_at.is_(None),
+            models.AnalysisCache.expires_at > datetime.utcnow(),
+        ),
+    ).first()
+
+    return (row.provider, row.analysis_text) if row else None
+
 
-    return system_prompt, user_prompt
+def save_cached_analysis(
+    cache_key: str,
+    provider: str,
+    analysis: str,
+    db: Session,
+    ttl_seconds: int = CACHE_TTL_SECONDS,
+):
+    """Save analysis to cache."""
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+
+    # cache_key is unique, so an expired (not yet swept) row or a failure marker
+    # is refreshed in place; a live analysis is never replaced
+    cache = db.query(models.AnalysisCache).filter(models.AnalysisCache.cache_key == cache_key).first()
+    if cache:
+        expired = cache.expires_at is not None and cache.expires_at <= now
+        if not expired and cache.provider not in FAILURE_PROVIDERS:
+            return
+        cache.provider = provider
+        cache.analysis_text = analysis
+        cache.created_at = now
+        cache.expires_at = expires_at
+    else:
+        db.add(models.AnalysisCache(
+            cache_key=cache_key,
+            provider=provider,
+            analysis_text=analysis,
+            input_hash=cache_key,
+            expires_at=expires_at
+        ))
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+
+
+def save_cached_analysis_task(cache_key: str, provider: str, analysis: str, ttl_seconds: int = CACHE_TTL_SECONDS):
+    """Background version of save_cached_analysis that uses its own session."""
+    # The request's session is closed by the time background tasks run
+    db = SessionLocal()
+    try:
+        save_cached_analysis(cache_key, provider, analysis, db, ttl_seconds)
+    finally:
+        db.close()
+
+
+def save_cached_analysis_later(cache_key: str, provider: str, analysis: str, ttl_seconds: int = CACHE_TTL_SECONDS):
+    """Start a cache write off the event loop without waiting for it."""
+    # Owned by the module rather than a request, so it runs even if every caller disconnects
+    task = asyncio.ensure_future(
+        asyncio.to_thread(save_cached_analysis_task, cache_key, provider, analysis, ttl_seconds)
+    )
+    _pending_saves.add(task)
+    task.add_done_callback(_pending_saves.discard)
+
+
+def _or_na(value) -> object:
+    """Show missing ranking fields as N/A in the prompt."""
+    return "N/A" if value is None else value
+
+
+def sweep_expired_cache() -> int:
+    """Delete all expired cache rows in a single statement; returns how many were removed."""
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            delete(models.AnalysisCache).where(models.AnalysisCache.expires_at < datetime.utcnow())
+        )
+        db.commit()
+        return result.rowcount
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def sweep_expired_cache_loop() -> None:
+    """Run sweep_expired_cache periodically without blocking the event loop."""
+    while True:
+        await asyncio.sleep(CACHE_SWEEP_INTERVAL_SECONDS)
+        try:
+            deleted = await asyncio.to_thread(sweep_expired_cache)
+            if deleted:
+                print(f"Swept {deleted} expired analysis cache entries")
+        except Exception as e:
+            print(f"Error sweeping analysis cache: {e}")
+
+
+@lru_cache(maxsize=2048)
+def build_prompt(players: tuple[RankingEntry, ...], comparison_type: str, style: str) -> tuple[str, str]:
+    """Build the analysis prompt based on style (memoized on the players tuple)."""
+    system_prompt = SYSTEM_PROMPTS.get(style, SYSTEM_PROMPTS["concise"])
+    parts = [USER_PROMPT_HEADERS.get(comparison_type, DEFAULT_USER_PROMPT_HEADER)]
+    parts.extend(
+        f"\n- {p.name}: ELO #{_or_na(p.rank)}, Ringer #{_or_na(p.ringerRank)}, "
+        f"H2H #{_or_na(p.h2hRank)} (Diff: {_or_na(p.diff)}). Stats: {_or_na(p.stats_summary)}"
+        for p in players
+    )
+
+    return system_prompt, "".join(parts)
 
 
-def generate_fallback_analysis(rankings: list[dict], style: str) -> str:
+def build_batch_prompt(prompts: list[tuple[str, str]]) -> tuple[str, str]:
+    """Combine several (system, user) prompt pairs into one JSON-answer prompt."""
+    parts = [
+        f"Answer the following {len(prompts)} independent analyses. "
+        'Respond with a JSON object of the form {"analyses": [{"id": <task number>, "analysis": "<text>"}]} '
+        "with exactly one entry per task.\n"
+    ]
+    for i, (system_prompt, user_prompt) in enumerate(prompts, start=1):
+        parts.append(f"\n### Task {i}\nPersona: {system_prompt}\n\n{user_prompt}\n")
+    return BATCH_SYSTEM_PROMPT, "".join(parts)
+
+
+def parse_batch_response(text: str, count: int) -> list[Optional[str]]:
+    """Split a batched JSON answer into per-task analyses (None where missing)."""
+    results: list[Optional[str]] = [None] * count
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end == -1:
+        return results
+    try:
+        data = json.loads(text[start:end + 1])
+    except ValueError:
+        return results
+    entries = data.get("analyses") if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        return results
+    # A malformed entry only loses that task, not the rest of the batch
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            idx = int(entry.get("id")) - 1
+        except (TypeError, ValueError):
+            continue
+        if 0 <= idx < count and entry.get("analysis"):
+            results[idx] = str(entry["analysis"])
+    return results
+
+
+def generate_fallback_analysis(rankings: Sequence[RankingEntry], style: str) -> str:
     """Generate a data-driven fallback when API is unavailable."""
     if not rankings:
         return "Unable to generate analysis - no data provided."
 
-    sorted_by_diff = sorted(rankings, key=lambda x: x.get('diff', 0) or 0)
-    undervalued = sorted_by_diff[:3] if sorted_by_diff else []
-    overvalued = sorted_by_diff[-3:] if sorted_by_diff else []
+    # A single C-level sort beats heapq.nsmallest/nlargest until the list has
+    # thousands of entries, far more than the frontend ever sends.
+    sorted_by_diff = sorted(rankings, key=lambda x: x.diff or 0)
+    undervalued = sorted_by_diff[:3]
+    overvalued = sorted_by_diff[-3:]
 
     if style == "hot_take":
-        return f"""🔥 **OVERRATED ALERT**: {overvalued[-1]['name'] if overvalued else 'Unknown'} - The hype machine is working overtime here!
-💎 **SLEEPING ON**: {undervalued[0]['name'] if undervalued else 'Unknown'} - The numbers don't lie, this player is cooking!
+        return f"""🔥 **OVERRATED ALERT**: {overvalued[-1].name if overvalued else 'Unknown'} - The hype machine is working overtime here!
+💎 **SLEEPING ON**: {undervalued[0].name if undervalued else 'Unknown'} - The numbers don't lie, this player is cooking!
 🤖 **THE TRUTH**: Advanced metrics consistently favor efficient two-way players over volume scorers
 🎯 **BOLD PREDICTION**: The undervalued players here will be ranked higher by next season"""
 
     elif style == "detailed":
-        return f"""**Most Overvalued**: {', '.join([p['name'] for p in reversed(overvalued)])} - Consensus rankings favor these players more than our analytical model suggests they deserve. This could be due to reputation, market size, or narrative-driven evaluation.
+        return f"""**Most Overvalued**: {', '.join([p.name for p in reversed(overvalued)])} - Consensus rankings favor these players more than our analytical model suggests they deserve. This could be due to reputation, market size, or narrative-driven evaluation.
 
-**Most Undervalued**: {', '.join([p['name'] for p in undervalued])} - Our model ranks these players significantly higher than consensus. They may be flying under the radar due to team situation or lack of media coverage.
+**Most Undervalued**: {', '.join([p.name for p in undervalued])} - Our model ranks these players significantly higher than consensus. They may be flying under the radar due to team situation or lack of media coverage.
 
 **Systematic Biases**: The People's Champ model tends to favor statistical efficiency and two-way impact over raw counting stats. Players who contribute quietly but effectively often rate higher.
 
 **Key Takeaway**: The gap between analytics and expert opinion reveals interesting market inefficiencies that could inform fantasy decisions or trade evaluations."""
 
     else:  # concise
-        return f"""• Most undervalued: {', '.join([p['name'] for p in undervalued])} - Our model ranks them higher than consensus
-• Most overvalued: {', '.join([p['name'] for p in reversed(overvalued)])} - Consensus ranks them higher than our model
+        return f"""• Most undervalued: {', '.join([p.name for p in undervalued])} - Our model ranks them higher than consensus
+• Most overvalued: {', '.join([p.name for p in reversed(overvalued)])} - Consensus ranks them higher than our model
 • Model bias: Advanced metrics favor efficient two-way players over high-usage scorers
 • Key insight: The People's Champ simulation blends analytics with expert opinion for balanced rankings"""
 
 
-async def generate_openai_analysis(system_prompt: str, user_prompt: str) -> str:
-    """Generate analysis using OpenAI."""
-    from openai import OpenAI
+@lru_cache(maxsize=1)
+def _openai_client():
+    """Shared OpenAI client so its connection pool is reused across requests."""
+    from openai import AsyncOpenAI
 
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("OPENAI_API_KEY not configured")
 
-    client = OpenAI(api_key=api_key)
+    return AsyncOpenAI(api_key=api_key)
+
+
+@lru_cache(maxsize=1)
+def _anthropic_client():
+    """Shared Anthropic client so its connection pool is reused across requests."""
+    import anthropic
+
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
+        raise ValueError("ANTHROPIC_API_KEY not configured")
+
+    return anthropic.AsyncAnthropic(api_key=api_key)
+
 
-    response = client.chat.completions.create(
-        model="gpt-4o",
+def warm_clients() -> None:
+    """Build the SDK clients for configured providers ahead of the first request."""
+    if PROVIDER_AVAILABILITY["openai"]:
+        _openai_client()
+    if PROVIDER_AVAILABILITY["claude"]:
+        _anthropic_client()
+
+
+async def generate_openai_analysis(
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int = 500,
+    json_mode: bool = False,
+    style: str = "detailed",
+) -> str:
+    """Generate analysis using OpenAI."""
+    client = _openai_client()
+
+    extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+    response = await client.chat.completions.create(
+        model=OPENAI_MODELS.get(style, OPENAI_MODELS["concise"]),
         messages=[
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ],
-        max_tokens=500,
-        temperature=0.4
+        max_tokens=max_tokens,
+        temperature=0.4,
+        **extra
     )
 
     return response.choices[0].message.content or ""
 
 
-async def generate_claude_analysis(system_prompt: str, user_prompt: str) -> str:
+async def generate_claude_analysis(
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int = 500,
+    style: str = "detailed",
+) -> str:
     """Generate analysis using Claude."""
-    import anthropic
+    client = _anthropic_client()
+
+    message = await client.messages.create(
+        model=CLAUDE_MODELS.get(style, CLAUDE_MODELS["concise"]),
+        max_tokens=max_tokens,
+        system=claude_system_blocks(system_prompt),
+        messages=[
+            {"role": "user", "content": user_prompt}
+        ]
+    )
+
+    return message.content[0].text if message.content else ""
+
+
+async def stream_openai_analysis(system_prompt: str, user_prompt: str, style: str = "detailed") -> AsyncIterator[str]:
+    """Stream analysis text from OpenAI as it is generated."""
+    client = _openai_client()
+
+    stream = await client.chat.completions.create(
+        model=OPENAI_MODELS.get(style, OPENAI_MODELS["concise"]),
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        max_tokens=500,
+        temperature=0.4,
+        stream=True
+    )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
 
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise ValueError("ANTHROPIC_API_KEY not configured")
 
-    client = anthropic.Anthropic(api_key=api_key)
+async def stream_claude_analysis(system_prompt: str, user_prompt: str, style: str = "detailed") -> AsyncIterator[str]:
+    """Stream analysis text from Claude as it is generated."""
+    client = _anthropic_client()
 
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
+    async with client.messages.stream(
+        model=CLAUDE_MODELS.get(style, CLAUDE_MODELS["concise"]),
         max_tokens=500,
-        system=system_prompt,
+        system=claude_system_blocks(system_prompt),
         messages=[
             {"role": "user", "content": user_prompt}
         ]
-    )
+    ) as stream:
+        async for text in stream.text_stream:
+            yield text
 
-    return message.content[0].text if message.content else ""
+
+def claude_system_blocks(system_prompt: str) -> list[dict]:
+    """System prompt as a cacheable content block for Anthropic prompt caching."""
+    return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+
+def sse_event(data: dict, event: Optional[str] = None) -> str:
+    """Format one server-sent event with a JSON payload."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+async def _generate_uncached(
+    players: tuple[RankingEntry, ...],
+    comparison_type: str,
+    style: str,
+    provider: str,
+    cache_key: str,
+    openai_available: bool,
+    claude_available: bool,
+) -> AnalysisResponse:
+    """Call the chosen provider (falling back to the other one) and cache the result without waiting on it."""
+    try:
+        system_prompt, user_prompt = build_prompt(players, comparison_type, style)
+
+        if provider == "claude":
+            analysis = await generate_claude_analysis(system_prompt, user_prompt, style=style)
+        else:
+            analysis = await generate_openai_analysis(system_prompt, user_prompt, style=style)
+
+        # Cache the result alongside the response rather than before it
+        save_cached_analysis_later(cache_key, provider, analysis)
+
+        print(f"Generated new analysis with {provider}, length={len(analysis)}")
+        return AnalysisResponse(analysis=analysis, provider=provider, cached=False)
+
+    except Exception as e:
+        print(f"Error generating analysis with {provider}: {e}")
+        rate_limited = getattr(e, "status_code", None) == 429
+
+        # Try fallback provider
+        fallback_provider = "openai" if provider == "claude" and openai_available else ("claude" if provider == "openai" and claude_available else None)
+
+        if fallback_provider:
+            try:
+                print(f"Trying fallback provider: {fallback_provider}")
+                if fallback_provider == "claude":
+                    analysis = await generate_claude_analysis(system_prompt, user_prompt, style=style)
+                else:
+                    analysis = await generate_openai_analysis(system_prompt, user_prompt, style=style)
+
+                save_cached_analysis_later(cache_key, fallback_provider, analysis)
+                return AnalysisResponse(analysis=analysis, provider=fallback_provider, cached=False)
+            except Exception as e2:
+                print(f"Fallback provider also failed: {e2}")
+
+        # All providers failed - return data-driven fallback and remember the failure briefly
+        fallback = generate_fallback_analysis(players, style)
+        if rate_limited:
+            save_cached_analysis_later(cache_key, "error:ratelimit", fallback, RATE_LIMITED_TTL_SECONDS)
+        else:
+            save_cached_analysis_later(cache_key, "fallback", fallback, FALLBACK_TTL_SECONDS)
+        return AnalysisResponse(analysis=fallback, provider="fallback", cached=False)
+
+
+def lookup_cached_response(cache_key: str, db: Session) -> Optional[AnalysisResponse]:
+    """Return the cached analysis, or the fallback cached after a recent provider failure."""
+    cached = get_cached_analysis(cache_key, db)
+    if not cached:
+        return None
+
+    provider, analysis = cached
+    if provider in FAILURE_PROVIDERS:
+        # Providers failed for this input moments ago - don't hit them again yet
+        print("Returning cached fallback after a recent provider failure")
+        return AnalysisResponse(analysis=analysis, provider="fallback", cached=True)
+
+    print(f"Returning cached analysis for provider={provider}")
+    return AnalysisResponse(analysis=analysis, provider=provider, cached=True)
+
+
+async def generate_or_join(
+    players: tuple[RankingEntry, ...],
+    comparison_type: str,
+    style: str,
+    provider: str,
+    cache_key: str,
+) -> AnalysisResponse:
+    """Generate an uncached analysis, sharing one generation between concurrent identical requests."""
+    # The shared task outlives whichever request started it, so it only takes plain
+    # values and persists its own result; no request-scoped Session or BackgroundTasks.
+    inflight_key = f"{provider}:{cache_key}"
+    task = _inflight.get(inflight_key)
+    if task is None:
+        task = asyncio.ensure_future(_generate_uncached(
+            players, comparison_type, style, provider, cache_key,
+            PROVIDER_AVAILABILITY["openai"], PROVIDER_AVAILABILITY["claude"],
+        ))
+        _inflight[inflight_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(inflight_key, None))
+    else:
+        print(f"Joining in-flight analysis for provider={provider}")
+
+    return await asyncio.shield(task)
 
 
 # ============ API Endpoints ============
@@ -243,29 +626,11 @@ async def generate_analysis(
     requested_provider = request.provider or "auto"
 
     # Generate cache key
-    cache_key = get_cache_key(request.rankings, comparison_type, style)
-
-    # Determine which providers are available
-    openai_available = bool(os.getenv("OPENAI_API_KEY"))
-    claude_available = bool(os.getenv("ANTHROPIC_API_KEY"))
+    players = tuple(request.rankings)
+    cache_key = get_cache_key(players, comparison_type, style)
 
     # Determine provider to use
-    if requested_provider == "auto":
-        # Prefer Claude if available, fall back to OpenAI
-        provider = "claude" if claude_available else ("openai" if openai_available else None)
-    elif requested_provider == "claude":
-        provider = "claude" if claude_available else None
-    elif requested_provider == "openai":
-        provider = "openai" if openai_available else None
-    else:
-        provider = None
-
-    # Check cache first
-    if provider:
-        cached = get_cached_analysis(cache_key, provider, db)
-        if cached:
-            print(f"Returning cached analysis for provider={provider}")
-            return AnalysisResponse(analysis=cached, provider=provider, cached=True)
+    provider = resolve_provider(requested_provider, PROVIDER_AVAILABILITY["openai"], PROVIDER_AVAILABILITY["claude"])
 
     # No API key available - return fallback
     if not provider:
@@ -273,43 +638,205 @@ async def generate_analysis(
         fallback = generate_fallback_analysis(request.rankings, style)
         return AnalysisResponse(analysis=fallback, provider="fallback", cached=False)
 
-    # Generate new analysis
-    try:
-        system_prompt, user_prompt = build_prompt(request.rankings, comparison_type, style)
+    # Check cache first; DB lookups run off the event loop
+    cached = await asyncio.to_thread(lookup_cached_response, cache_key, db)
+    if cached:
+        return cached
 
-        if provider == "claude":
-            analysis = await generate_claude_analysis(system_prompt, user_prompt)
-        else:
-            analysis = await generate_openai_analysis(system_prompt, user_prompt)
+    return await generate_or_join(players, comparison_type, style, provider, cache_key)
 
-        # Cache the result
-        save_cached_analysis(cache_key, provider, analysis, db)
 
-        print(f"Generated new analysis with {provider}, length={len(analysis)}")
-        return AnalysisResponse(analysis=analysis, provider=provider, cached=False)
+@router.post("/generate/stream")
+async def generate_analysis_stream(
+    request: AnalysisRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Stream AI analysis as server-sent events.
 
-    except Exception as e:
-        print(f"Error generating analysis with {provider}: {e}")
+    Each `data:` event carries a `{"text": ...}` fragment; a final `done`
+    event reports the provider and whether the text came from the cache.
+    The full text is cached once the stream completes.
+    """
+    style = request.analysis_style or "concise"
+    comparison_type = request.comparison_type or "general"
+    provider = resolve_provider(
+        request.provider or "auto",
+        PROVIDER_AVAILABILITY["openai"],
+        PROVIDER_AVAILABILITY["claude"],
+    )
+    players = tuple(request.rankings)
+    cache_key = get_cache_key(players, comparison_type, style)
+    cached = await asyncio.to_thread(lookup_cached_response, cache_key, db) if provider else None
 
-        # Try fallback provider
-        fallback_provider = "openai" if provider == "claude" and openai_available else ("claude" if provider == "openai" and claude_available else None)
+    async def events() -> AsyncIterator[str]:
+        if cached:
+            yield sse_event({"text": cached.analysis})
+            yield sse_event({"provider": cached.provider, "cached": True}, event="done")
+            return
+
+        if not provider:
+            yield sse_event({"text": generate_fallback_analysis(request.rankings, style)})
+            yield sse_event({"provider": "fallback", "cached": False}, event="done")
+            return
+
+        system_prompt, user_prompt = build_prompt(players, comparison_type, style)
+        stream = stream_claude_analysis if provider == "claude" else stream_openai_analysis
+        parts: list[str] = []
+        try:
+            async for text in stream(system_prompt, user_prompt, style=style):
+                parts.append(text)
+                yield sse_event({"text": text})
+        except Exception as e:
+            print(f"Error streaming analysis with {provider}: {e}")
+            if parts:
+                yield sse_event({"detail": "Analysis stream interrupted"}, event="error")
+                return
+            fallback = generate_fallback_analysis(request.rankings, style)
+            if getattr(e, "status_code", None) == 429:
+                await asyncio.to_thread(
+                    save_cached_analysis_task, cache_key, "error:ratelimit", fallback, RATE_LIMITED_TTL_SECONDS
+                )
+            else:
+                await asyncio.to_thread(
+                    save_cached_analysis_task, cache_key, "fallback", fallback, FALLBACK_TTL_SECONDS
+                )
+            yield sse_event({"text": fallback})
+            yield sse_event({"provider": "fallback", "cached": False}, event="done")
+            return
+
+        # The request's session may already be closed once streaming starts
+        await asyncio.to_thread(save_cached_analysis_task, cache_key, provider, "".join(parts))
+        yield sse_event({"provider": provider, "cached": False}, event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-        if fallback_provider:
+
+@router.post("/generate-batch", response_model=list[AnalysisResponse])
+async def generate_analysis_batch(
+    requests: list[AnalysisRequest],
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """
+    Generate several analyses with a single LLM call per provider and style.
+
+    Cached analyses are served as-is; the remaining ones are answered by one
+    batched prompt and each answer is cached under its own key, so later
+    single /generate requests for the same data hit the cache.
+    """
+    if len(requests) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SIZE} analyses per batch")
+
+    openai_available = PROVIDER_AVAILABILITY["openai"]
+    claude_available = PROVIDER_AVAILABILITY["claude"]
+
+    results: list[Optional[AnalysisResponse]] = [None] * len(requests)
+    # Batched per (provider, style) so each answer comes from its style's model,
+    # the same one a single /generate would use for that cache key
+    pending: dict[tuple[str, str], list[tuple[int, AnalysisRequest, str, tuple[str, str]]]] = {}
+
+    for i, request in enumerate(requests):
+        style = request.analysis_style or "concise"
+        comparison_type = request.comparison_type or "general"
+        provider = resolve_provider(request.provider or "auto", openai_available, claude_available)
+
+        if not provider:
+            fallback = generate_fallback_analysis(request.rankings, style)
+            results[i] = AnalysisResponse(analysis=fallback, provider="fallback", cached=False)
+            continue
+
+        players = tuple(request.rankings)
+        cache_key = get_cache_key(players, comparison_type, style)
+        cached = await asyncio.to_thread(lookup_cached_response, cache_key, db)
+        if cached:
+            results[i] = cached
+            continue
+
+        prompt = build_prompt(players, comparison_type, style)
+        pending.setdefault((provider, style), []).append((i, request, cache_key, prompt))
+
+    for (provider, style), items in pending.items():
+        analyses: list[Optional[str]] = [None] * len(items)
+
+        if len(items) > 1:
+            prompts = [prompt for _, _, _, prompt in items]
+            system_prompt, user_prompt = build_batch_prompt(prompts)
+            max_tokens = 500 * len(items)
             try:
-                print(f"Trying fallback provider: {fallback_provider}")
-                if fallback_provider == "claude":
-                    analysis = await generate_claude_analysis(system_prompt, user_prompt)
+                if provider == "claude":
+                    text = await generate_claude_analysis(system_prompt, user_prompt, max_tokens=max_tokens, style=style)
                 else:
-                    analysis = await generate_openai_analysis(system_prompt, user_prompt)
-
-                save_cached_analysis(cache_key, fallback_provider, analysis, db)
-                return AnalysisResponse(analysis=analysis, provider=fallback_provider, cached=False)
-            except Exception as e2:
-                print(f"Fallback provider also failed: {e2}")
+                    text = await generate_openai_analysis(
+                        system_prompt, user_prompt, max_tokens=max_tokens, json_mode=True, style=style
+                    )
+                analyses = parse_batch_response(text, len(items))
+                print(f"Generated {sum(1 for a in analyses if a)}/{len(items)} batched {style} analyses with {provider}")
+            except Exception as e:
+                print(f"Error generating batched {style} analysis with {provider}: {e}")
+
+        for (i, request, cache_key, _), analysis in zip(items, analyses):
+            if analysis:
+                background_tasks.add_task(save_cached_analysis_task, cache_key, provider, analysis)
+                results[i] = AnalysisResponse(analysis=analysis, provider=provider, cached=False)
+            else:
+                # Single item, or the batch did not answer it: use the regular path
+                results[i] = await generate_analysis(request, db)
+
+    return results
+
+
+@router.post("/generate-parallel", response_model=list[AnalysisResponse])
+async def generate_analysis_parallel(
+    requests: list[AnalysisRequest],
+    db: Session = Depends(get_db)
+):
+    """
+    Generate several analyses as independent, concurrent LLM calls.
 
-        # All providers failed - return data-driven fallback
-        fallback = generate_fallback_analysis(request.rankings, style)
-        return AnalysisResponse(analysis=fallback, provider="fallback", cached=False)
+    Unlike /generate-batch each analysis keeps its own prompt and output
+    budget, so total latency is that of the slowest call rather than one
+    long combined completion.
+    """
+    if len(requests) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SIZE} analyses per request")
+
+    results: list[Optional[AnalysisResponse]] = [None] * len(requests)
+    uncached: list[tuple[int, tuple[RankingEntry, ...], str, str, str, str]] = []
+
+    # The request's Session is not thread-safe, so every cache lookup happens
+    # here one at a time; only the provider calls below run concurrently.
+    for i, request in enumerate(requests):
+        style = request.analysis_style or "concise"
+        comparison_type = request.comparison_type or "general"
+        provider = resolve_provider(
+            request.provider or "auto",
+            PROVIDER_AVAILABILITY["openai"],
+            PROVIDER_AVAILABILITY["claude"],
+        )
+        if not provider:
+            fallback = generate_fallback_analysis(request.rankings, style)
+            results[i] = AnalysisResponse(analysis=fallback, provider="fallback", cached=False)
+            continue
+
+        players = tuple(request.rankings)
+        cache_key = get_cache_key(players, comparison_type, style)
+        results[i] = await asyncio.to_thread(lookup_cached_response, cache_key, db)
+        if results[i] is None:
+            uncached.append((i, players, comparison_type, style, provider, cache_key))
+
+    generated = await asyncio.gather(*(
+        generate_or_join(players, comparison_type, style, provider, cache_key)
+        for _, players, comparison_type, style, provider, cache_key in uncached
+    ))
+    for (i, *_), response in zip(uncached, generated):
+        results[i] = response
+
+    return results
 
 
 @router.get("/styles")
@@ -333,10 +860,7 @@ async def get_analysis_styles():
                 "description": "Bold, entertaining analysis"
             }
         ],
-        "providers": {
-            "openai": bool(os.getenv("OPENAI_API_KEY")),
-            "claude": bool(os.getenv("ANTHROPIC_API_KEY"))
-        }
+        "providers": dict(PROVIDER_AVAILABILITY)
     }
 
 
@@ -354,7 +878,7 @@ def save_feedback(feedback: FeedbackCreate, db: Session = Depends(get_db)):
 
 
 @router.delete("/cache")
-async def clear_cache(db: Session = Depends(get_db)):
+def clear_cache(db: Session = Depends(get_db)):
     """Clear all cached analyses (admin endpoint)."""
     deleted = db.query(models.AnalysisCache).delete()
     db.commit()
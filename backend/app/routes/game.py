@@ -1,15 +1,21 @@
 import json
+import operator
 import random
-from datetime import date
-from functools import cmp_to_key
-from itertools import combinations
+import re
+import secrets
+import threading
+from bisect import bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+from itertools import accumulate, combinations
 from logging import getLogger
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from sqlalchemy import func, insert, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
 
 from ..db.session import get_db
 from .. import models
@@ -20,10 +26,39 @@ from ..core.config import settings
 router = APIRouter(prefix="/game", tags=["game"])
 logger = getLogger(__name__)
 
+# Load a daily set's players and matchups in two IN queries instead of one per row
+_DAILY_SET_GAME_OPTIONS = (
+    selectinload(models.DailySet.players).selectinload(models.DailySetPlayer.player),
+    selectinload(models.DailySet.matchups),
+)
+
+# Serialized game responses keyed by (date, season). A day's set doesn't change,
+# so /game/today and /game/day only hit the database once per day and season.
+_game_response_cache: Dict[Tuple[date, str], bytes] = {}
+_today_lock = threading.Lock()
+# First key of the Postgres advisory lock taken while creating a day's set
+_DAILY_SET_LOCK_NAMESPACE = 0x5043
+
+
+def clear_game_response_cache() -> None:
+    """Drop cached game responses; call whenever daily sets or players change."""
+    _game_response_cache.clear()
+    build_player_stats.cache_clear()
+    build_advanced_stats.cache_clear()
+
+
+def _json_response(content: bytes | str) -> Response:
+    """Return already-serialized JSON without FastAPI re-validating it."""
+    return Response(content=content, media_type="application/json")
+
+
+# Anything that is not str.isalnum() or whitespace (\w also matches "_")
+_NON_NAME_CHARS = re.compile(r"[^\w\s]|_")
+
 
 def _normalize_name(name: str) -> str:
     """Normalize player names for fuzzy matching across data sources."""
-    return "".join(ch for ch in name.lower() if ch.isalnum() or ch.isspace()).strip()
+    return _NON_NAME_CHARS.sub("", name.lower()).strip()
 
 
 def _weighted_unique_sample(players: List[models.Player], weights: List[int], k: int) -> List[models.Player]:
@@ -31,19 +66,26 @@ def _weighted_unique_sample(players: List[models.Player], weights: List[int], k:
     if k <= 0:
         return []
 
+    # Draw from one cumulative table and redraw on repeats, which gives the same
+    # odds as removing each pick and renormalizing the remaining weights
+    k = min(k, sum(1 for weight in weights if weight > 0))
+    cum_weights = list(accumulate(weights))
+    chosen: set = set()
     selected: List[models.Player] = []
-    available_players = players[:]
-    available_weights = weights[:]
 
-    while len(selected) < k and available_players:
-        idx = random.choices(range(len(available_players)), weights=available_weights, k=1)[0]
-        selected.append(available_players.pop(idx))
-        available_weights.pop(idx)
+    while len(selected) < k:
+        idx = bisect_right(cum_weights, random.random() * cum_weights[-1])
+        if idx not in chosen:
+            chosen.add(idx)
+            selected.append(players[idx])
 
     return selected
 
 
 class PlayerStats(BaseModel):
+    # Frozen because build_player_stats hands out shared cached instances
+    model_config = ConfigDict(frozen=True)
+
     # Core per-game stats
     pts: Optional[float] = None
     reb: Optional[float] = None
@@ -85,6 +127,8 @@ class PlayerStats(BaseModel):
 
 class AdvancedStats(BaseModel):
     """Advanced stats from BBRef (PER, WS, BPM, VORP, etc.)"""
+    model_config = ConfigDict(frozen=True)
+
     per: Optional[float] = None           # Player Efficiency Rating
     ts_pct: Optional[float] = None        # True Shooting %
     usg_pct: Optional[float] = None       # Usage %
@@ -112,6 +156,11 @@ class AdvancedStats(BaseModel):
     tov_pct_pctl: Optional[float] = None
 
 
+# Fields filled straight from the stats loader's dicts
+_PLAYER_STATS_FIELDS = tuple(field for field in PlayerStats.model_fields if field != "top_stats")
+_ADVANCED_STATS_FIELDS = tuple(AdvancedStats.model_fields)
+
+
 class PlayerOut(BaseModel):
     id: str
     name: str
@@ -144,6 +193,10 @@ class AnswerIn(BaseModel):
     winner_id: str
 
 
+# Serializes submitted answers straight to JSON in pydantic-core
+_answers_adapter = TypeAdapter(List[AnswerIn])
+
+
 class GameSubmitRequest(BaseModel):
     daily_set_id: int
     mode: str
@@ -196,17 +249,12 @@ class ArchiveResponse(BaseModel):
     total_days: int
 
 
-def int_to_base36(number: int) -> str:
-    chars = "0123456789abcdefghijklmnopqrstuvwxyz"
-    if number == 0:
-        return "0"
-    result = ""
-    while number:
-        number, rem = divmod(number, 36)
-        result = chars[rem] + result
-    return result
+def generate_share_slug(game_date: date) -> str:
+    """Date prefix plus a random token, so the slug is known before the row is inserted."""
+    return f"{game_date.strftime('%y%m%d')}{secrets.token_urlsafe(6)}"
 
 
+@lru_cache(maxsize=4096)
 def build_player_stats(player_id: str, position: str, season: str = "current") -> Optional[PlayerStats]:
     """Build PlayerStats from CSV data with percentiles and position ranks"""
     stats_data = get_stats_with_percentiles(player_id, season)
@@ -217,43 +265,14 @@ def build_player_stats(player_id: str, position: str, season: str = "current") -
     # Get top stats for this position
     top_stats = get_top_stats_for_position(position or stats_data.get("position", ""))
     
-    return PlayerStats(
-        pts=stats_data.get("pts"),
-        reb=stats_data.get("reb"),
-        ast=stats_data.get("ast"),
-        stl=stats_data.get("stl"),
-        blk=stats_data.get("blk"),
-        three_pct=stats_data.get("three_pct"),
-        ft_pct=stats_data.get("ft_pct"),
-        efg_pct=stats_data.get("efg_pct"),
-        tov=stats_data.get("tov"),
-        mpg=stats_data.get("mpg"),
-        games=stats_data.get("games"),
-        pos_count=stats_data.get("pos_count"),
-        # Percentiles
-        pts_pctl=stats_data.get("pts_pctl"),
-        reb_pctl=stats_data.get("reb_pctl"),
-        ast_pctl=stats_data.get("ast_pctl"),
-        stl_pctl=stats_data.get("stl_pctl"),
-        blk_pctl=stats_data.get("blk_pctl"),
-        three_pctl=stats_data.get("three_pctl"),
-        ft_pctl=stats_data.get("ft_pctl"),
-        efg_pctl=stats_data.get("efg_pctl"),
-        tov_pctl=stats_data.get("tov_pctl"),
-        # Position ranks
-        pts_pos_rank=stats_data.get("pts_pos_rank"),
-        reb_pos_rank=stats_data.get("reb_pos_rank"),
-        ast_pos_rank=stats_data.get("ast_pos_rank"),
-        stl_pos_rank=stats_data.get("stl_pos_rank"),
-        blk_pos_rank=stats_data.get("blk_pos_rank"),
-        three_pos_rank=stats_data.get("three_pos_rank"),
-        ft_pos_rank=stats_data.get("ft_pos_rank"),
-        efg_pos_rank=stats_data.get("efg_pos_rank"),
-        tov_pos_rank=stats_data.get("tov_pos_rank"),
+    # CSV-derived values are already typed, so skip per-field validation
+    return PlayerStats.model_construct(
+        **{field: stats_data.get(field) for field in _PLAYER_STATS_FIELDS},
         top_stats=top_stats,
     )
 
 
+@lru_cache(maxsize=4096)
 def build_advanced_stats(player_id: str, season: str = "current") -> Optional[AdvancedStats]:
     """Build AdvancedStats from BBRef Advanced CSV data with percentiles"""
     adv_data = get_advanced_stats_with_percentiles(player_id, season)
@@ -261,69 +280,97 @@ def build_advanced_stats(player_id: str, season: str = "current") -> Optional[Ad
     if not adv_data:
         return None
     
-    return AdvancedStats(
-        per=adv_data.get("per"),
-        ts_pct=adv_data.get("ts_pct"),
-        usg_pct=adv_data.get("usg_pct"),
-        ws=adv_data.get("ws"),
-        ws_48=adv_data.get("ws_48"),
-        ows=adv_data.get("ows"),
-        dws=adv_data.get("dws"),
-        obpm=adv_data.get("obpm"),
-        dbpm=adv_data.get("dbpm"),
-        bpm=adv_data.get("bpm"),
-        vorp=adv_data.get("vorp"),
-        tov_pct=adv_data.get("tov_pct"),
-        games=adv_data.get("games"),
-        minutes=adv_data.get("minutes"),
-        per_pctl=adv_data.get("per_pctl"),
-        ts_pctl=adv_data.get("ts_pctl"),
-        ws_pctl=adv_data.get("ws_pctl"),
-        ws_48_pctl=adv_data.get("ws_48_pctl"),
-        bpm_pctl=adv_data.get("bpm_pctl"),
-        vorp_pctl=adv_data.get("vorp_pctl"),
-        usg_pctl=adv_data.get("usg_pctl"),
-        obpm_pctl=adv_data.get("obpm_pctl"),
-        dbpm_pctl=adv_data.get("dbpm_pctl"),
-        tov_pct_pctl=adv_data.get("tov_pct_pctl"),
-    )
+    return AdvancedStats.model_construct(**{field: adv_data.get(field) for field in _ADVANCED_STATS_FIELDS})
 
 
 def compute_final_ranking(
-    players: List[models.Player],
-    matchups: List[models.Matchup],
+    player_ids: List[str],
+    matchup_pairs: Dict[int, Tuple[str, str]],
     answers: List[AnswerIn],
+    validate: bool = True,
 ) -> List[str]:
-    win_counts: Dict[str, int] = {player.id: 0 for player in players}
-    matchup_map: Dict[int, models.Matchup] = {m.id: m for m in matchups}
-    head_to_head: Dict[frozenset, str] = {}
+    """
+    Rank players by matchup wins, breaking ties by head-to-head results.
+
+    matchup_pairs maps matchup id to its (player1_id, player2_id). Pass
+    validate=False when the caller has already checked that every answer
+    refers to one of those matchups.
+    """
+    # Work on integer player positions so the counting below is plain list indexing
+    index: Dict[str, int] = {pid: i for i, pid in enumerate(player_ids)}
+    wins = [0] * len(player_ids)
+    results: List[Tuple[int, int]] = []  # (winner index, loser index)
 
     for answer in answers:
-        matchup = matchup_map.get(answer.matchup_id)
-        if not matchup:
+        if validate and answer.matchup_id not in matchup_pairs:
             raise HTTPException(status_code=400, detail="Matchup not part of the daily set")
-        if answer.winner_id not in {matchup.player1_id, matchup.player2_id}:
+        player1_id, player2_id = matchup_pairs[answer.matchup_id]
+        # Still checked on the fast path: it is also how the loser is found
+        if answer.winner_id == player1_id:
+            loser_id = player2_id
+        elif answer.winner_id == player2_id:
+            loser_id = player1_id
+        else:
             raise HTTPException(status_code=400, detail="Winner not in matchup")
-        win_counts[answer.winner_id] = win_counts.get(answer.winner_id, 0) + 1
-        head_to_head[frozenset({matchup.player1_id, matchup.player2_id})] = answer.winner_id
+        winner, loser = index.get(answer.winner_id), index.get(loser_id)
+        if winner is None or loser is None:
+            continue  # matchup player outside the ranked set; can't affect the order
+        wins[winner] += 1
+        results.append((winner, loser))
 
-    player_ids = [p.id for p in players]
+    # Players tied on wins are ordered by head-to-head wins among themselves,
+    # which for two players is simply who won their matchup.
+    tiebreak_wins = [0] * len(player_ids)
+    for winner, loser in results:
+        if wins[winner] == wins[loser]:
+            tiebreak_wins[winner] += 1
 
-    def compare(a_id: str, b_id: str) -> int:
-        wins_a = win_counts.get(a_id, 0)
-        wins_b = win_counts.get(b_id, 0)
-        if wins_a != wins_b:
-            return -1 if wins_a > wins_b else 1
-        head_key = frozenset({a_id, b_id})
-        if head_key in head_to_head:
-            winner = head_to_head[head_key]
-            if winner == a_id:
-                return -1
-            if winner == b_id:
-                return 1
-        return -1 if a_id < b_id else 1 if a_id > b_id else 0
+    order = sorted(range(len(player_ids)), key=lambda i: (-wins[i], -tiebreak_wins[i], player_ids[i]))
+    return [player_ids[i] for i in order]
 
-    return sorted(player_ids, key=cmp_to_key(compare))
+
+def _cache_game_response(daily_set: models.DailySet, season: str) -> bytes:
+    """Serialize the game payload for a daily set and remember it for later requests."""
+    players = [dsp.player for dsp in daily_set.players]
+    matchups = daily_set.matchups  # ordered by order_index on the relationship
+
+    response = GameTodayResponse(
+        daily_set_id=daily_set.id,
+        date=daily_set.date,
+        mode_options=["GUESS", "OWN"],
+        season_options=["current", "combined"],
+        current_season=season,
+        players=[
+            PlayerOut(
+                id=p.id,
+                name=p.name,
+                team=p.team,
+                position=p.position,
+                stats=build_player_stats(p.id, p.position, season),
+                advanced=build_advanced_stats(p.id, season),
+                season=season,
+            )
+            for p in players
+        ],
+        matchups=[
+            MatchupOut(
+                id=m.id,
+                player_a_id=m.player1_id,
+                player_b_id=m.player2_id,
+                order_index=m.order_index or 0,
+            )
+            for m in matchups
+        ],
+    )
+    content = response.model_dump_json().encode()
+
+    # Only the past week is reachable, so older days are never read again
+    oldest = date.today() - timedelta(days=7)
+    for key in [key for key in _game_response_cache if key[0] < oldest]:
+        del _game_response_cache[key]
+    _game_response_cache[(daily_set.date, season)] = content
+
+    return content
 
 
 @router.get("/debug/schedule")
@@ -358,29 +405,41 @@ def debug_schedule(db: Session = Depends(get_db)):
         return {"error": str(e)}
 
 
-@router.get("/today", response_model=GameTodayResponse)
-def get_today(db: Session = Depends(get_db), season: str = "current"):
-    """Get today's game with player stats. Season can be 'current' (25-26) or 'combined' (24-25 + 25-26)"""
-    if season not in ["current", "combined"]:
-        season = "current"
-    today = date.today()
-    logger.info("/game/today called for date=%s season=%s", today, season)
-    
-    daily_set = db.query(models.DailySet).filter(models.DailySet.date == today).first()
+def _load_daily_set(db: Session, day: date) -> Optional[models.DailySet]:
+    """Fetch the daily set for a date with everything the game payload reads."""
+    return (
+        db.query(models.DailySet)
+        .options(*_DAILY_SET_GAME_OPTIONS)
+        .filter(models.DailySet.date == day)
+        .first()
+    )
+
+
+def _load_or_create_today(db: Session, today: date, season: str) -> bytes:
+    """Load today's daily set, creating it on the first request of the day."""
+    daily_set = _load_daily_set(db, today)
     logger.info("/game/today existing daily_set=%s", daily_set is not None)
 
+    if not daily_set and settings.is_postgres:
+        # Other workers may be creating the same set: wait for them, then look again.
+        # The lock is released when this transaction commits or rolls back.
+        db.execute(
+            text("SELECT pg_advisory_xact_lock(:namespace, :day)"),
+            {"namespace": _DAILY_SET_LOCK_NAMESPACE, "day": today.toordinal()},
+        )
+        daily_set = _load_daily_set(db, today)
+
     if not daily_set:
         logger.info("No daily set found for %s; creating one", today)
         # Select exactly 5 players for the daily set from Ringer Top 50
-        player_count = db.query(models.Player).count()
-        logger.info("Total players in DB: %s", player_count)
-
         # Get Ringer Top 50 player names
         ringer_top_50_names = get_ringer_player_names(50)
         logger.info("Loaded %s names from Ringer Top 50", len(ringer_top_50_names))
 
         # Build a fast normalized-name lookup once instead of running 50 DB ILIKE queries.
-        all_players = db.query(models.Player).all()
+        # Picking the set only needs ids, so skip loading the stat columns.
+        all_players = db.query(models.Player.id, models.Player.name).all()
+        logger.info("Total players in DB: %s", len(all_players))
         player_by_normalized_name = {_normalize_name(p.name): p for p in all_players}
         ringer_players: List[models.Player] = []
 
@@ -417,7 +476,7 @@ def get_today(db: Session = Depends(get_db), season: str = "current"):
             # Fallback to top 25 by win shares if not enough Ringer players found
             logger.warning("Not enough Ringer players matched; falling back to win shares")
             top_players = (
-                db.query(models.Player)
+                db.query(models.Player.id)
                 .order_by(models.Player.total_ws.desc())
                 .limit(25)
                 .all()
@@ -437,13 +496,10 @@ def get_today(db: Session = Depends(get_db), season: str = "current"):
                 players = _weighted_unique_sample(top_players, weights, k=5)
                 logger.info("Selected %s weighted top players (fallback)", len(players))
             else:
-                # Final fallback to random
-                players = (
-                    db.query(models.Player)
-                    .order_by(func.random())
-                    .limit(5)
-                    .all()
-                )
+                # Final fallback to random: sample ids in Python rather than sorting the table by random()
+                player_ids = [player_id for (player_id,) in db.query(models.Player.id)]
+                sampled_ids = random.sample(player_ids, min(5, len(player_ids)))
+                players = db.query(models.Player.id).filter(models.Player.id.in_(sampled_ids)).all()
                 logger.info("Selected %s random players (final fallback)", len(players))
         
         if len(players) < 5:
@@ -455,25 +511,28 @@ def get_today(db: Session = Depends(get_db), season: str = "current"):
             db.flush()
             logger.info("Created daily_set with id=%s", daily_set.id)
 
-            # Add all 5 players to the daily set
-            for player in players:
-                db.add(
-                    models.DailySetPlayer(
-                        daily_set_id=daily_set.id,
-                        player_id=player.id,
-                    )
-                )
+            # Read the ids once instead of going through ORM attributes per pair
+            player_ids = [player.id for player in players]
+
+            # Add all 5 players to the daily set (one bulk INSERT, no unit-of-work tracking)
+            db.execute(
+                insert(models.DailySetPlayer),
+                [{"daily_set_id": daily_set.id, "player_id": player_id} for player_id in player_ids],
+            )
 
             # Create all possible matchups between the 5 players (C(5,2) = 10 matchups)
-            for idx, (p1, p2) in enumerate(combinations(players, 2)):
-                db.add(
-                    models.Matchup(
-                        daily_set_id=daily_set.id,
-                        player1_id=p1.id,
-                        player2_id=p2.id,
-                        order_index=idx,
-                    )
-                )
+            db.execute(
+                insert(models.Matchup),
+                [
+                    {
+                        "daily_set_id": daily_set.id,
+                        "player1_id": p1_id,
+                        "player2_id": p2_id,
+                        "order_index": idx,
+                    }
+                    for idx, (p1_id, p2_id) in enumerate(combinations(player_ids, 2))
+                ],
+            )
 
             # No true ranking needed for individual matchup voting
             daily_set.true_ranking = None
@@ -484,7 +543,7 @@ def get_today(db: Session = Depends(get_db), season: str = "current"):
         except Exception as e:
             db.rollback()
             # Handle race condition where another request created today's daily set first.
-            maybe_existing = db.query(models.DailySet).filter(models.DailySet.date == today).first()
+            maybe_existing = _load_daily_set(db, today)
             if maybe_existing:
                 logger.warning("Daily set creation race detected; using existing set id=%s", maybe_existing.id)
                 daily_set = maybe_existing
@@ -492,63 +551,61 @@ def get_today(db: Session = Depends(get_db), season: str = "current"):
                 logger.exception("Failed creating daily set for %s", today)
                 raise HTTPException(status_code=500, detail="Failed to create daily set")
 
-    players = [dsp.player for dsp in daily_set.players]
-    matchups = sorted(daily_set.matchups, key=lambda m: m.order_index or 0)
+    return _cache_game_response(daily_set, season)
 
-    return GameTodayResponse(
-        daily_set_id=daily_set.id,
-        date=daily_set.date,
-        mode_options=["GUESS", "OWN"],
-        season_options=["current", "combined"],
-        current_season=season,
-        players=[
-            PlayerOut(
-                id=p.id, 
-                name=p.name, 
-                team=p.team,
-                position=p.position,
-                stats=build_player_stats(p.id, p.position, season),
-                advanced=build_advanced_stats(p.id, season),
-                season=season,
-            ) 
-            for p in players
-        ],
-        matchups=[
-            MatchupOut(
-                id=m.id,
-                player_a_id=m.player1_id,
-                player_b_id=m.player2_id,
-                order_index=m.order_index or 0,
-            )
-            for m in matchups
-        ],
-    )
+
+@router.get("/today", response_model=GameTodayResponse)
+def get_today(db: Session = Depends(get_db), season: str = "current"):
+    """Get today's game with player stats. Season can be 'current' (25-26) or 'combined' (24-25 + 25-26)"""
+    if season not in ["current", "combined"]:
+        season = "current"
+    today = date.today()
+    logger.info("/game/today called for date=%s season=%s", today, season)
+
+    cached = _game_response_cache.get((today, season))
+    if cached is not None:
+        return _json_response(cached)
+    
+    # First request of the day builds the set; concurrent ones wait for it
+    with _today_lock:
+        cached = _game_response_cache.get((today, season))
+        if cached is None:
+            cached = _load_or_create_today(db, today, season)
+    return _json_response(cached)
 
 
 @router.post("/submit", response_model=GameSubmitResponse)
 def submit_game(request: GameSubmitRequest, db: Session = Depends(get_db)):
-    daily_set = db.query(models.DailySet).filter(models.DailySet.id == request.daily_set_id).first()
+    if request.mode not in {"GUESS", "OWN"}:
+        raise HTTPException(status_code=400, detail="Invalid mode")
+
+    daily_set = (
+        db.query(models.DailySet)
+        .options(*_DAILY_SET_GAME_OPTIONS)
+        .filter(models.DailySet.id == request.daily_set_id)
+        .first()
+    )
     if not daily_set:
         raise HTTPException(status_code=404, detail="Daily set not found")
     if daily_set.date != date.today():
         raise HTTPException(status_code=400, detail="Submission must be for today's game")
 
-    if len(request.answers) != len(daily_set.matchups):
-        raise HTTPException(status_code=400, detail=f"Must answer all {len(daily_set.matchups)} matchups")
-    matchup_ids = [a.matchup_id for a in request.answers]
-    if len(set(matchup_ids)) != len(matchup_ids):
-        raise HTTPException(status_code=400, detail="Duplicate matchup answers")
+    matchup_pairs = {m.id: (m.player1_id, m.player2_id) for m in daily_set.matchups}
+    if len(request.answers) != len(matchup_pairs):
+        raise HTTPException(status_code=400, detail=f"Must answer all {len(matchup_pairs)} matchups")
 
-    matchup_map = {m.id: m for m in daily_set.matchups}
-    if set(matchup_ids) != set(matchup_map.keys()):
-        raise HTTPException(status_code=400, detail="Answers do not match required matchups")
+    # Same count, no duplicates and all known means every matchup is answered exactly once
+    seen_matchup_ids = set()
+    for answer in request.answers:
+        if answer.matchup_id in seen_matchup_ids:
+            raise HTTPException(status_code=400, detail="Duplicate matchup answers")
+        if answer.matchup_id not in matchup_pairs:
+            raise HTTPException(status_code=400, detail="Answers do not match required matchups")
+        seen_matchup_ids.add(answer.matchup_id)
 
     players = [dsp.player for dsp in daily_set.players]
-    final_ranking_ids = compute_final_ranking(players, list(matchup_map.values()), request.answers)
     player_lookup = {p.id: p for p in players}
-
-    if request.mode not in {"GUESS", "OWN"}:
-        raise HTTPException(status_code=400, detail="Invalid mode")
+    final_ranking_ids = compute_final_ranking(list(player_lookup), matchup_pairs, request.answers, validate=False)
 
     true_ranking = json.loads(daily_set.true_ranking) if daily_set.true_ranking else []
     max_points = 100 if request.mode == "GUESS" else None
@@ -556,27 +613,9 @@ def submit_game(request: GameSubmitRequest, db: Session = Depends(get_db)):
     explanation = None
 
     if request.mode == "GUESS" and true_ranking:
-        points = 0
-        for idx, player_id in enumerate(final_ranking_ids):
-            if idx < len(true_ranking) and player_id == true_ranking[idx]:
-                points += 20
+        points = 20 * sum(map(operator.eq, final_ranking_ids, true_ranking))
         explanation = f"Matched {points // 20} of 5 positions."
 
-    submission = models.Submission(
-        daily_set_id=daily_set.id,
-        mode=request.mode,
-        answers=json.dumps([a.dict() for a in request.answers]),
-        final_ranking=json.dumps(final_ranking_ids),
-        score=points,
-        share_slug="",
-    )
-    db.add(submission)
-    db.flush()
-
-    submission.share_slug = f"{daily_set.date.strftime('%y%m%d')}{int_to_base36(submission.id)}"
-    db.commit()
-    db.refresh(submission)
-
     final_ranking_entries = [
         RankingEntry(
             id=pid,
@@ -587,6 +626,27 @@ def submit_game(request: GameSubmitRequest, db: Session = Depends(get_db)):
         for index, pid in enumerate(final_ranking_ids)
     ]
 
+    answers_json = _answers_adapter.dump_json(request.answers).decode()
+    final_ranking_json = json.dumps(final_ranking_ids)
+    # share_slug is unique; retry with a fresh token in the unlikely case of a collision
+    for _ in range(3):
+        submission = models.Submission(
+            daily_set_id=daily_set.id,
+            mode=request.mode,
+            answers=answers_json,
+            final_ranking=final_ranking_json,
+            score=points,
+            share_slug=generate_share_slug(daily_set.date),
+        )
+        db.add(submission)
+        try:
+            db.commit()
+            break
+        except IntegrityError:
+            db.rollback()
+    else:
+        raise HTTPException(status_code=500, detail="Failed to save submission")
+
     return GameSubmitResponse(
         submission_id=submission.id,
         share_slug=submission.share_slug,
@@ -603,14 +663,41 @@ def submit_game(request: GameSubmitRequest, db: Session = Depends(get_db)):
 
 @router.get("/share/{share_slug}", response_model=SharedResultResponse)
 def get_shared_result(share_slug: str, db: Session = Depends(get_db)):
-    submission = db.query(models.Submission).filter(models.Submission.share_slug == share_slug).first()
+    # The ranked players are the daily set's players, so one joined query loads everything.
+    # Only the columns the response uses are selected (not the answers or player stats).
+    submission = (
+        db.query(models.Submission)
+        .options(
+            load_only(
+                models.Submission.daily_set_id,
+                models.Submission.mode,
+                models.Submission.final_ranking,
+                models.Submission.score,
+            ),
+            joinedload(models.Submission.daily_set).options(
+                load_only(models.DailySet.date),
+                joinedload(models.DailySet.players)
+                .joinedload(models.DailySetPlayer.player)
+                .load_only(models.Player.name, models.Player.team),
+            ),
+        )
+        .filter(models.Submission.share_slug == share_slug)
+        .first()
+    )
     if not submission:
         raise HTTPException(status_code=404, detail="Shared result not found")
 
-    daily_set = db.query(models.DailySet).filter(models.DailySet.id == submission.daily_set_id).first()
+    daily_set = submission.daily_set
     player_ids = json.loads(submission.final_ranking)
-    players = db.query(models.Player).filter(models.Player.id.in_(player_ids)).all()
-    player_lookup = {p.id: p for p in players}
+    player_lookup = {dsp.player.id: dsp.player for dsp in daily_set.players} if daily_set else {}
+    missing_ids = [pid for pid in player_ids if pid not in player_lookup]
+    if missing_ids:
+        # Only when the daily set was reset after the submission was shared
+        rows = db.query(models.Player.id, models.Player.name, models.Player.team).filter(
+            models.Player.id.in_(missing_ids)
+        )
+        for row in rows:
+            player_lookup[row.id] = row
 
     final_ranking_entries = [
         RankingEntry(
@@ -628,12 +715,12 @@ def get_shared_result(share_slug: str, db: Session = Depends(get_db)):
     elif submission.mode == "OWN":
         score_summary = "Custom People’s Champ ranking"
 
-    return SharedResultResponse(
+    return _json_response(SharedResultResponse(
         date=daily_set.date if daily_set else date.today(),
         mode=submission.mode,
         final_ranking=final_ranking_entries,
         score_summary=score_summary,
-    )
+    ).model_dump_json())
 
 
 @router.get("/day/{target_date}", response_model=GameTodayResponse)
@@ -657,43 +744,17 @@ def get_day(target_date: str, db: Session = Depends(get_db), season: str = "curr
         raise HTTPException(status_code=400, detail="Cannot access future games")
     if game_date < seven_days_ago:
         raise HTTPException(status_code=403, detail="Vault access limited to past 7 days")
+
+    cached = _game_response_cache.get((game_date, season))
+    if cached is not None:
+        return _json_response(cached)
     
-    daily_set = db.query(models.DailySet).filter(models.DailySet.date == game_date).first()
+    daily_set = _load_daily_set(db, game_date)
     
     if not daily_set:
         raise HTTPException(status_code=404, detail=f"No game found for {target_date}")
     
-    players = [dsp.player for dsp in daily_set.players]
-    matchups = sorted(daily_set.matchups, key=lambda m: m.order_index or 0)
-    
-    return GameTodayResponse(
-        daily_set_id=daily_set.id,
-        date=daily_set.date,
-        mode_options=["GUESS", "OWN"],
-        season_options=["current", "combined"],
-        current_season=season,
-        players=[
-            PlayerOut(
-                id=p.id, 
-                name=p.name, 
-                team=p.team,
-                position=p.position,
-                stats=build_player_stats(p.id, p.position, season),
-                advanced=build_advanced_stats(p.id, season),
-                season=season,
-            ) 
-            for p in players
-        ],
-        matchups=[
-            MatchupOut(
-                id=m.id,
-                player_a_id=m.player1_id,
-                player_b_id=m.player2_id,
-                order_index=m.order_index or 0,
-            )
-            for m in matchups
-        ],
-    )
+    return _json_response(_cache_game_response(daily_set, season))
 
 
 @router.get("/archive", response_model=ArchiveResponse)
@@ -705,20 +766,30 @@ def get_archive(db: Session = Depends(get_db)):
     seven_days_ago = today - timedelta(days=7)
     
     # Only show past 7 days for vault access
-    daily_sets = db.query(models.DailySet).filter(
+    daily_sets = db.query(models.DailySet).options(
+        selectinload(models.DailySet.players)
+        .selectinload(models.DailySetPlayer.player)
+        .load_only(models.Player.name, models.Player.team)
+    ).filter(
         models.DailySet.date >= seven_days_ago,
         models.DailySet.date <= today
     ).order_by(models.DailySet.date.desc()).all()
     
+    # Count total votes for every listed set in one grouped query
+    vote_counts = dict(
+        db.query(models.Matchup.daily_set_id, func.count(models.UserChoice.id))
+        .join(models.UserChoice)
+        .filter(models.Matchup.daily_set_id.in_([ds.id for ds in daily_sets]))
+        .group_by(models.Matchup.daily_set_id)
+        .all()
+    )
+
     archives = []
     for daily_set in daily_sets:
-        # Count total votes for this daily set
-        total_votes = db.query(models.UserChoice).join(models.Matchup).filter(
-            models.Matchup.daily_set_id == daily_set.id
-        ).count()
+        total_votes = vote_counts.get(daily_set.id, 0)
         
         # Check if voting is completed (arbitrary threshold)
-        is_completed = total_votes > 0 or daily_set.date < date.today()
+        is_completed = total_votes > 0 or daily_set.date < today
         
         archives.append(ArchiveEntry(
             date=daily_set.date,
@@ -1,10 +1,13 @@
-from datetime import date
+import time
+from datetime import date, datetime
 from typing import Optional
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from ..db.session import get_db
 from .. import models
@@ -12,6 +15,53 @@ from ..core.config import settings
 
 router = APIRouter(prefix="/voting", tags=["voting"])
 
+# Aggregate vote responses are the same for every visitor, so they are served from
+# memory for a short while and dropped whenever a vote changes the tallies
+GLOBAL_RANKINGS_TTL_SECONDS = 30
+ALL_TIME_VOTES_TTL_SECONDS = 300
+_aggregate_cache: dict[str, tuple[float, BaseModel]] = {}
+
+# Today's daily set id and matchup count, looked up once per day instead of per vote
+_today_set_cache: dict[date, tuple[int, int]] = {}
+
+
+def clear_voting_cache() -> None:
+    """Drop cached vote aggregates; call whenever votes, daily sets or players change."""
+    _aggregate_cache.clear()
+    _today_set_cache.clear()
+
+
+def _get_today_set(db: Session, today: date) -> Optional[tuple[int, int]]:
+    """Return (daily_set_id, matchup_count) for today, or None if no set exists yet."""
+    cached = _today_set_cache.get(today)
+    if cached is not None:
+        return cached
+
+    daily_set_id = db.query(models.DailySet.id).filter(models.DailySet.date == today).scalar()
+    if daily_set_id is None:
+        return None
+
+    matchup_count = db.query(func.count(models.Matchup.id)).filter(
+        models.Matchup.daily_set_id == daily_set_id
+    ).scalar()
+    _today_set_cache.clear()
+    _today_set_cache[today] = (daily_set_id, matchup_count)
+    return _today_set_cache[today]
+
+
+def _get_cached_aggregate(key: str) -> Optional[BaseModel]:
+    entry = _aggregate_cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _set_cached_aggregate(key: str, response: BaseModel, ttl_seconds: int) -> None:
+    now = time.monotonic()
+    for stale_key in [k for k, (expires, _) in _aggregate_cache.items() if expires <= now]:
+        del _aggregate_cache[stale_key]
+    _aggregate_cache[key] = (now + ttl_seconds, response)
+
 
 class VoteRequest(BaseModel):
     matchup_id: int
@@ -88,15 +138,15 @@ def submit_vote(
     """Submit a vote for a matchup. Works for both authenticated and anonymous users."""
     
     # Get today's daily set
-    today = date.today()
-    daily_set = db.query(models.DailySet).filter(models.DailySet.date == today).first()
-    if not daily_set:
+    today_set = _get_today_set(db, date.today())
+    if not today_set:
         raise HTTPException(status_code=404, detail="No daily set available")
+    daily_set_id, _ = today_set
     
     # Validate matchup exists and is part of today's set
     matchup = db.query(models.Matchup).filter(
         models.Matchup.id == vote.matchup_id,
-        models.Matchup.daily_set_id == daily_set.id
+        models.Matchup.daily_set_id == daily_set_id
     ).first()
     if not matchup:
         raise HTTPException(status_code=404, detail="Matchup not found")
@@ -108,28 +158,31 @@ def submit_vote(
     # Always rely on server-managed session cookie for identity
     session_id = get_or_create_session_id(request, response)
     
-    # Check if vote already exists for this session/matchup
-    existing_vote = db.query(models.UserChoice).filter(
-        models.UserChoice.matchup_id == vote.matchup_id,
-        models.UserChoice.session_id == session_id
-    ).first()
-    
-    if existing_vote:
-        # Update existing vote
-        existing_vote.winner_player_id = vote.winner_player_id
-        db.commit()
-        message = "Vote updated successfully"
-    else:
-        # Create new vote
-        new_vote = models.UserChoice(
-            user_id=None,  # Anonymous for now
-            session_id=session_id,
-            matchup_id=vote.matchup_id,
-            winner_player_id=vote.winner_player_id
-        )
-        db.add(new_vote)
-        db.commit()
+    # Insert or overwrite this session's vote in one statement, keyed on the
+    # (session_id, matchup_id) unique constraint. created_at is only written on
+    # insert, so getting our own timestamp back means the vote is new.
+    dialect_insert = postgresql.insert if settings.is_postgres else sqlite.insert
+    now = datetime.utcnow()
+    stmt = dialect_insert(models.UserChoice).values(
+        user_id=None,  # Anonymous for now
+        session_id=session_id,
+        matchup_id=vote.matchup_id,
+        winner_player_id=vote.winner_player_id,
+        created_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.UserChoice.session_id, models.UserChoice.matchup_id],
+        set_={"winner_player_id": stmt.excluded.winner_player_id},
+    ).returning(models.UserChoice.created_at)
+    created_at = db.execute(stmt).scalar_one()
+    db.commit()
+    
+    if created_at == now:
         message = "Vote submitted successfully"
+    else:
+        message = "Vote updated successfully"
+    # The tallies changed; today's set did not
+    _aggregate_cache.clear()
     
     return VoteResponse(
         success=True,
@@ -154,21 +207,19 @@ def get_voting_status(
     """Get current user's voting status for today"""
     
     # Get today's daily set
-    today = date.today()
-    daily_set = db.query(models.DailySet).filter(models.DailySet.date == today).first()
-    if not daily_set:
+    today_set = _get_today_set(db, date.today())
+    if not today_set:
         return UserVotesResponse(votes_today=0, total_matchups=0, completed=False)
+    daily_set_id, total_matchups = today_set
     
     session_id = get_or_create_session_id(request, response)
     
     # Count votes for this session today
     votes_today = db.query(models.UserChoice).join(models.Matchup).filter(
         models.UserChoice.session_id == session_id,
-        models.Matchup.daily_set_id == daily_set.id
+        models.Matchup.daily_set_id == daily_set_id
     ).count()
     
-    total_matchups = len(daily_set.matchups)
-    
     return UserVotesResponse(
         votes_today=votes_today,
         total_matchups=total_matchups,
@@ -184,20 +235,19 @@ def get_my_votes(
 ):
     """Get current user's votes for today with details"""
     
-    today = date.today()
-    daily_set = db.query(models.DailySet).filter(models.DailySet.date == today).first()
-    if not daily_set:
+    today_set = _get_today_set(db, date.today())
+    if not today_set:
         return UserVotesDetailResponse(votes_today=0, total_matchups=0, completed=False, votes={})
+    daily_set_id, total_matchups = today_set
     
     session_id = get_or_create_session_id(request, response)
     
     user_votes = db.query(models.UserChoice).join(models.Matchup).filter(
         models.UserChoice.session_id == session_id,
-        models.Matchup.daily_set_id == daily_set.id
+        models.Matchup.daily_set_id == daily_set_id
     ).all()
     
     votes_dict = {vote.matchup_id: vote.winner_player_id for vote in user_votes}
-    total_matchups = len(daily_set.matchups)
     
     return UserVotesDetailResponse(
         votes_today=len(user_votes),
@@ -211,16 +261,24 @@ def get_my_votes(
 def get_matchup_results(matchup_id: int, db: Session = Depends(get_db)):
     """Get aggregate voting results for a specific matchup"""
     
-    matchup = db.query(models.Matchup).filter(models.Matchup.id == matchup_id).first()
+    matchup = db.query(models.Matchup).options(
+        joinedload(models.Matchup.player1).load_only(models.Player.name),
+        joinedload(models.Matchup.player2).load_only(models.Player.name),
+    ).filter(models.Matchup.id == matchup_id).first()
     if not matchup:
         raise HTTPException(status_code=404, detail="Matchup not found")
     
     # Count votes for each player
-    votes = db.query(models.UserChoice).filter(models.UserChoice.matchup_id == matchup_id).all()
+    votes_by_winner = dict(
+        db.query(models.UserChoice.winner_player_id, func.count(models.UserChoice.id))
+        .filter(models.UserChoice.matchup_id == matchup_id)
+        .group_by(models.UserChoice.winner_player_id)
+        .all()
+    )
     
-    player1_votes = sum(1 for vote in votes if vote.winner_player_id == matchup.player1_id)
-    player2_votes = sum(1 for vote in votes if vote.winner_player_id == matchup.player2_id)
-    total_votes = len(votes)
+    player1_votes = votes_by_winner.get(matchup.player1_id, 0)
+    player2_votes = votes_by_winner.get(matchup.player2_id, 0)
+    total_votes = sum(votes_by_winner.values())
     
     return {
         "matchup_id": matchup_id,
@@ -247,7 +305,15 @@ def get_global_rankings(db: Session = Depends(get_db)):
     Rankings are calculated by counting wins across all matchups.
     """
     today = date.today()
-    daily_set = db.query(models.DailySet).filter(models.DailySet.date == today).first()
+    cache_key = f"global-rankings:{today}"
+    cached = _get_cached_aggregate(cache_key)
+    if cached is not None:
+        return cached
+
+    daily_set = db.query(models.DailySet).options(
+        selectinload(models.DailySet.players).selectinload(models.DailySetPlayer.player),
+        selectinload(models.DailySet.matchups),
+    ).filter(models.DailySet.date == today).first()
     
     if not daily_set:
         return GlobalRankingsResponse(
@@ -263,27 +329,37 @@ def get_global_rankings(db: Session = Depends(get_db)):
     # Get all matchups for today
     matchups = daily_set.matchups
     
-    # Get all votes for today's matchups
-    all_votes = db.query(models.UserChoice).join(models.Matchup).filter(
-        models.Matchup.daily_set_id == daily_set.id
-    ).all()
+    # Tally today's votes in the database: one row per (matchup, winner)
+    vote_counts = dict(
+        ((matchup_id, winner_id), count)
+        for matchup_id, winner_id, count in db.query(
+            models.UserChoice.matchup_id,
+            models.UserChoice.winner_player_id,
+            func.count(models.UserChoice.id),
+        )
+        .join(models.Matchup)
+        .filter(models.Matchup.daily_set_id == daily_set.id)
+        .group_by(models.UserChoice.matchup_id, models.UserChoice.winner_player_id)
+    )
+    voted_matchup_ids = {matchup_id for matchup_id, _ in vote_counts}
     
-    # Count unique voters (by session_id)
-    unique_sessions = set(vote.session_id for vote in all_votes if vote.session_id)
-    total_voters = len(unique_sessions)
-    total_votes = len(all_votes)
+    # Count all votes and unique voters (by session_id)
+    total_votes, total_voters = db.query(
+        func.count(models.UserChoice.id),
+        func.count(func.distinct(models.UserChoice.session_id)),
+    ).join(models.Matchup).filter(
+        models.Matchup.daily_set_id == daily_set.id
+    ).one()
     
     # Calculate wins for each player
     player_stats = {pid: {"wins": 0, "total_matchups": 0, "votes_received": 0} for pid in players}
     
     for matchup in matchups:
-        matchup_votes = [v for v in all_votes if v.matchup_id == matchup.id]
-        
-        if not matchup_votes:
+        if matchup.id not in voted_matchup_ids:
             continue
         
-        p1_votes = sum(1 for v in matchup_votes if v.winner_player_id == matchup.player1_id)
-        p2_votes = sum(1 for v in matchup_votes if v.winner_player_id == matchup.player2_id)
+        p1_votes = vote_counts.get((matchup.id, matchup.player1_id), 0)
+        p2_votes = vote_counts.get((matchup.id, matchup.player2_id), 0)
         
         # Track votes received and matchups played
         if matchup.player1_id in player_stats:
@@ -318,12 +394,14 @@ def get_global_rankings(db: Session = Depends(get_db)):
     # Sort by wins (desc), then by votes received (desc)
     rankings.sort(key=lambda x: (x.wins, x.total_votes_received), reverse=True)
     
-    return GlobalRankingsResponse(
+    result = GlobalRankingsResponse(
         date=today,
         rankings=rankings,
         total_voters=total_voters,
         total_votes=total_votes
     )
+    _set_cached_aggregate(cache_key, result, GLOBAL_RANKINGS_TTL_SECONDS)
+    return result
 
 
 class AllTimePlayerStats(BaseModel):
@@ -348,53 +426,71 @@ def get_all_time_votes(db: Session = Depends(get_db)):
     Get all-time head-to-head vote tallies for all players.
     This aggregates votes across all daily sets ever played.
     """
-    from collections import defaultdict
-    
-    # Get all matchups with their votes
-    all_matchups = db.query(models.Matchup).all()
-    all_votes = db.query(models.UserChoice).all()
-    
-    # Build vote lookup by matchup_id
-    votes_by_matchup = defaultdict(list)
-    for vote in all_votes:
-        votes_by_matchup[vote.matchup_id].append(vote)
+    cached = _get_cached_aggregate("all-time-votes")
+    if cached is not None:
+        return cached
+    
+    # Tally every vote in the database: one row per (matchup, winner), in matchup order
+    rows = db.query(
+        models.Matchup.id,
+        models.Matchup.player1_id,
+        models.Matchup.player2_id,
+        models.UserChoice.winner_player_id,
+        func.count(models.UserChoice.id),
+    ).join(
+        models.UserChoice, models.UserChoice.matchup_id == models.Matchup.id
+    ).group_by(
+        models.Matchup.id,
+        models.Matchup.player1_id,
+        models.Matchup.player2_id,
+        models.UserChoice.winner_player_id,
+    ).order_by(models.Matchup.id).all()
+    
+    # matchup_id -> [player1_id, player2_id, player1 votes, player2 votes]
+    tallies: dict[int, list] = {}
+    total_votes = 0
+    for matchup_id, player1_id, player2_id, winner_id, count in rows:
+        total_votes += count
+        tally = tallies.get(matchup_id)
+        if tally is None:
+            tally = tallies[matchup_id] = [player1_id, player2_id, 0, 0]
+        if winner_id == player1_id:
+            tally[2] += count
+        elif winner_id == player2_id:
+            tally[3] += count
     
     # Track stats for each player
-    player_stats = defaultdict(lambda: {
-        "total_h2h_votes": 0,
-        "total_matchups": 0,
-        "h2h_wins": 0
-    })
-    
-    # Get all players for name lookup
-    all_players = {p.id: p for p in db.query(models.Player).all()}
-    
-    total_matchups_with_votes = 0
+    player_stats: dict[str, dict[str, int]] = {}
     
-    for matchup in all_matchups:
-        matchup_votes = votes_by_matchup.get(matchup.id, [])
-        
-        if not matchup_votes:
-            continue
-        
-        total_matchups_with_votes += 1
-        
-        p1_votes = sum(1 for v in matchup_votes if v.winner_player_id == matchup.player1_id)
-        p2_votes = sum(1 for v in matchup_votes if v.winner_player_id == matchup.player2_id)
+    for player1_id, player2_id, p1_votes, p2_votes in tallies.values():
+        p1_stats = player_stats.setdefault(
+            player1_id, {"total_h2h_votes": 0, "total_matchups": 0, "h2h_wins": 0}
+        )
+        p2_stats = player_stats.setdefault(
+            player2_id, {"total_h2h_votes": 0, "total_matchups": 0, "h2h_wins": 0}
+        )
         
         # Track stats for player 1
-        player_stats[matchup.player1_id]["total_h2h_votes"] += p1_votes
-        player_stats[matchup.player1_id]["total_matchups"] += 1
+        p1_stats["total_h2h_votes"] += p1_votes
+        p1_stats["total_matchups"] += 1
         
         # Track stats for player 2
-        player_stats[matchup.player2_id]["total_h2h_votes"] += p2_votes
-        player_stats[matchup.player2_id]["total_matchups"] += 1
+        p2_stats["total_h2h_votes"] += p2_votes
+        p2_stats["total_matchups"] += 1
         
         # Determine winner
         if p1_votes > p2_votes:
-            player_stats[matchup.player1_id]["h2h_wins"] += 1
+            p1_stats["h2h_wins"] += 1
         elif p2_votes > p1_votes:
-            player_stats[matchup.player2_id]["h2h_wins"] += 1
+            p2_stats["h2h_wins"] += 1
+    
+    # Look up names only for players who appear in a voted matchup
+    all_players = {
+        player_id: (name, team)
+        for player_id, name, team in db.query(
+            models.Player.id, models.Player.name, models.Player.team
+        ).filter(models.Player.id.in_(player_stats))
+    } if player_stats else {}
     
     # Build response
     players_list = []
@@ -402,13 +498,14 @@ def get_all_time_votes(db: Session = Depends(get_db)):
         player = all_players.get(player_id)
         if not player:
             continue
+        name, team = player
         
         win_rate = (stats["h2h_wins"] / stats["total_matchups"] * 100) if stats["total_matchups"] > 0 else 0
         
         players_list.append(AllTimePlayerStats(
             id=player_id,
-            name=player.name,
-            team=player.team,
+            name=name,
+            team=team,
             total_h2h_votes=stats["total_h2h_votes"],
             total_matchups=stats["total_matchups"],
             h2h_wins=stats["h2h_wins"],
@@ -418,8 +515,10 @@ def get_all_time_votes(db: Session = Depends(get_db)):
     # Sort by total votes received (desc)
     players_list.sort(key=lambda x: x.total_h2h_votes, reverse=True)
     
-    return AllTimeVotesResponse(
+    result = AllTimeVotesResponse(
         players=players_list,
-        total_votes=len(all_votes),
-        total_matchups=total_matchups_with_votes
+        total_votes=total_votes,
+        total_matchups=len(tallies)
     )
+    _set_cached_aggregate("all-time-votes", result, ALL_TIME_VOTES_TTL_SECONDS)
+    return result
@@ -4,7 +4,8 @@ Supports loading from current season (25-26) or combined seasons (24-25 + 25-26)
 """
 import csv
 import os
-from typing import Dict, List, Optional
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 
 # Path to data directories
@@ -231,36 +232,70 @@ def get_player_stats(player_id: str, season: str = "current") -> Optional[Player
     return all_stats.get(player_id)
 
 
+def sorted_positive(values: Iterable[Optional[float]]) -> List[float]:
+    """Ascending list of the positive values, the population percentiles are ranked against"""
+    return sorted(v for v in values if v is not None and v > 0)
+
+
+def percentile_in_sorted(value: float, sorted_values: List[float]) -> float:
+    """Percentile rank (0-100) of a value within a list from sorted_positive()"""
+    if value is None or not sorted_values:
+        return 0.0
+    return round((bisect_left(sorted_values, value) / len(sorted_values)) * 100, 1)
+
+
+def position_rank_in_sorted(value: float, sorted_values: List[float], higher_is_better: bool = True) -> int:
+    """Rank (1 = best) of a value within a list from sorted_positive()"""
+    if value is None or not sorted_values:
+        return 0
+    if higher_is_better:
+        return len(sorted_values) - bisect_right(sorted_values, value) + 1
+    return bisect_left(sorted_values, value) + 1
+
+
 def calculate_percentile(value: float, all_values: List[float]) -> float:
     """Calculate percentile rank (0-100) for a value within a list"""
     if not all_values or value is None:
         return 0.0
-    sorted_values = sorted([v for v in all_values if v is not None and v > 0])
-    if not sorted_values:
-        return 0.0
-    count_below = sum(1 for v in sorted_values if v < value)
-    return round((count_below / len(sorted_values)) * 100, 1)
+    return percentile_in_sorted(value, sorted_positive(all_values))
 
 
 def calculate_position_rank(value: float, all_values: List[float], higher_is_better: bool = True) -> int:
     """Calculate rank among position (1 = best)"""
     if not all_values or value is None:
         return 0
-    valid_values = [v for v in all_values if v is not None and v > 0]
-    if not valid_values:
-        return 0
-    if higher_is_better:
-        sorted_values = sorted(valid_values, reverse=True)
-    else:
-        sorted_values = sorted(valid_values)
-    try:
-        return sorted_values.index(value) + 1
-    except ValueError:
-        # Value not in list, find where it would rank
-        for i, v in enumerate(sorted_values):
-            if (higher_is_better and value >= v) or (not higher_is_better and value <= v):
-                return i + 1
-        return len(sorted_values) + 1
+    return position_rank_in_sorted(value, sorted_positive(all_values), higher_is_better)
+
+
+PERGAME_PERCENTILE_FIELDS = ("pts", "reb", "ast", "stl", "blk", "efg_pct", "three_pct", "ft_pct", "tov")
+
+# Sorted stat columns keyed by (season, primary position or None for league-wide),
+# along with the number of players in that group
+_pergame_columns_cache: Dict[Tuple[str, Optional[str]], Tuple[int, Dict[str, List[float]]]] = {}
+
+
+def primary_position(position: Optional[str]) -> Optional[str]:
+    """First listed position, e.g. "PG" for "PG-SG" """
+    return position.split('-')[0].strip().upper() if position else None
+
+
+def get_pergame_columns(season: str, position: Optional[str] = None) -> Tuple[int, Dict[str, List[float]]]:
+    """
+    Sorted per-game stat columns for a season, optionally limited to one primary position.
+
+    Built once per group so percentiles and ranks are a binary search per stat.
+    """
+    cache_key = (season, position)
+    if cache_key not in _pergame_columns_cache:
+        group = list(get_all_player_stats(season).values())
+        if position is not None:
+            group = [s for s in group if primary_position(s.position) == position]
+        columns = {
+            field: sorted_positive(getattr(s, field) for s in group)
+            for field in PERGAME_PERCENTILE_FIELDS
+        }
+        _pergame_columns_cache[cache_key] = (len(group), columns)
+    return _pergame_columns_cache[cache_key]
 
 
 def get_stats_with_percentiles(
@@ -278,34 +313,13 @@ def get_stats_with_percentiles(
     if not player_stats:
         return None
     
-    # Get player's primary position
-    player_pos = player_stats.position.split('-')[0].strip().upper() if player_stats.position else None
-    
-    # Filter stats by position for position rank
-    pos_stats = [s for s in all_stats.values() if s.position and s.position.split('-')[0].strip().upper() == player_pos] if player_pos else []
-    pos_count = len(pos_stats)
-    
-    # Calculate percentiles against all players
-    all_pts = [s.pts for s in all_stats.values()]
-    all_reb = [s.reb for s in all_stats.values()]
-    all_ast = [s.ast for s in all_stats.values()]
-    all_stl = [s.stl for s in all_stats.values()]
-    all_blk = [s.blk for s in all_stats.values()]
-    all_efg = [s.efg_pct for s in all_stats.values()]
-    all_three = [s.three_pct for s in all_stats.values()]
-    all_ft = [s.ft_pct for s in all_stats.values()]
-    all_tov = [s.tov for s in all_stats.values()]
-    
-    # Position-specific stats for ranking
-    pos_pts = [s.pts for s in pos_stats]
-    pos_reb = [s.reb for s in pos_stats]
-    pos_ast = [s.ast for s in pos_stats]
-    pos_stl = [s.stl for s in pos_stats]
-    pos_blk = [s.blk for s in pos_stats]
-    pos_efg = [s.efg_pct for s in pos_stats]
-    pos_three = [s.three_pct for s in pos_stats]
-    pos_ft = [s.ft_pct for s in pos_stats]
-    pos_tov = [s.tov for s in pos_stats]
+    # League-wide columns for percentiles, the player's primary position for ranks
+    _, league = get_pergame_columns(season)
+    player_pos = primary_position(player_stats.position)
+    if player_pos:
+        pos_count, pos = get_pergame_columns(season, player_pos)
+    else:
+        pos_count, pos = 0, {field: [] for field in PERGAME_PERCENTILE_FIELDS}
     
     return {
         "pts": player_stats.pts,
@@ -322,25 +336,25 @@ def get_stats_with_percentiles(
         "position": player_stats.position,
         "pos_count": pos_count,  # Total players at this position
         # Percentiles (league-wide)
-        "pts_pctl": calculate_percentile(player_stats.pts, all_pts),
-        "reb_pctl": calculate_percentile(player_stats.reb, all_reb),
-        "ast_pctl": calculate_percentile(player_stats.ast, all_ast),
-        "stl_pctl": calculate_percentile(player_stats.stl, all_stl),
-        "blk_pctl": calculate_percentile(player_stats.blk, all_blk),
-        "efg_pctl": calculate_percentile(player_stats.efg_pct, all_efg),
-        "three_pctl": calculate_percentile(player_stats.three_pct, all_three),
-        "ft_pctl": calculate_percentile(player_stats.ft_pct, all_ft),
-        "tov_pctl": 100 - calculate_percentile(player_stats.tov, all_tov),
+        "pts_pctl": percentile_in_sorted(player_stats.pts, league["pts"]),
+        "reb_pctl": percentile_in_sorted(player_stats.reb, league["reb"]),
+        "ast_pctl": percentile_in_sorted(player_stats.ast, league["ast"]),
+        "stl_pctl": percentile_in_sorted(player_stats.stl, league["stl"]),
+        "blk_pctl": percentile_in_sorted(player_stats.blk, league["blk"]),
+        "efg_pctl": percentile_in_sorted(player_stats.efg_pct, league["efg_pct"]),
+        "three_pctl": percentile_in_sorted(player_stats.three_pct, league["three_pct"]),
+        "ft_pctl": percentile_in_sorted(player_stats.ft_pct, league["ft_pct"]),
+        "tov_pctl": 100 - percentile_in_sorted(player_stats.tov, league["tov"]),
         # Position ranks (1 = best at position)
-        "pts_pos_rank": calculate_position_rank(player_stats.pts, pos_pts),
-        "reb_pos_rank": calculate_position_rank(player_stats.reb, pos_reb),
-        "ast_pos_rank": calculate_position_rank(player_stats.ast, pos_ast),
-        "stl_pos_rank": calculate_position_rank(player_stats.stl, pos_stl),
-        "blk_pos_rank": calculate_position_rank(player_stats.blk, pos_blk),
-        "efg_pos_rank": calculate_position_rank(player_stats.efg_pct, pos_efg),
-        "three_pos_rank": calculate_position_rank(player_stats.three_pct, pos_three),
-        "ft_pos_rank": calculate_position_rank(player_stats.ft_pct, pos_ft),
-        "tov_pos_rank": calculate_position_rank(player_stats.tov, pos_tov, higher_is_better=False),
+        "pts_pos_rank": position_rank_in_sorted(player_stats.pts, pos["pts"]),
+        "reb_pos_rank": position_rank_in_sorted(player_stats.reb, pos["reb"]),
+        "ast_pos_rank": position_rank_in_sorted(player_stats.ast, pos["ast"]),
+        "stl_pos_rank": position_rank_in_sorted(player_stats.stl, pos["stl"]),
+        "blk_pos_rank": position_rank_in_sorted(player_stats.blk, pos["blk"]),
+        "efg_pos_rank": position_rank_in_sorted(player_stats.efg_pct, pos["efg_pct"]),
+        "three_pos_rank": position_rank_in_sorted(player_stats.three_pct, pos["three_pct"]),
+        "ft_pos_rank": position_rank_in_sorted(player_stats.ft_pct, pos["ft_pct"]),
+        "tov_pos_rank": position_rank_in_sorted(player_stats.tov, pos["tov"], higher_is_better=False),
     }
 
 
@@ -370,9 +384,11 @@ def get_top_stats_for_position(position: str) -> List[str]:
 
 def clear_stats_cache():
     """Clear the stats cache (useful for testing or when data is updated)"""
-    global _stats_cache, _adv_stats_cache
+    global _stats_cache, _adv_stats_cache, _pergame_columns_cache, _advanced_columns_cache
     _stats_cache = {}
     _adv_stats_cache = {}
+    _pergame_columns_cache = {}
+    _advanced_columns_cache = {}
 
 
 # ============== ADVANCED STATS LOADING ==============
@@ -536,6 +552,23 @@ def get_all_advanced_stats(season: str = "current") -> Dict[str, PlayerAdvancedS
     return combined
 
 
+ADVANCED_PERCENTILE_FIELDS = ("per", "ts_pct", "ws", "ws_48", "bpm", "vorp", "usg_pct", "obpm", "dbpm", "tov_pct")
+
+# Sorted advanced stat columns keyed by season
+_advanced_columns_cache: Dict[str, Dict[str, List[float]]] = {}
+
+
+def get_advanced_columns(season: str) -> Dict[str, List[float]]:
+    """Sorted league-wide advanced stat columns for a season, built once per season"""
+    if season not in _advanced_columns_cache:
+        all_stats = get_all_advanced_stats(season).values()
+        _advanced_columns_cache[season] = {
+            field: sorted_positive(getattr(s, field) for s in all_stats)
+            for field in ADVANCED_PERCENTILE_FIELDS
+        }
+    return _advanced_columns_cache[season]
+
+
 def get_advanced_stats_with_percentiles(
     player_id: str,
     season: str = "current"
@@ -549,17 +582,8 @@ def get_advanced_stats_with_percentiles(
     if not player_stats:
         return None
     
-    # Calculate percentiles against all players
-    all_per = [s.per for s in all_stats.values() if s.per > 0]
-    all_ts = [s.ts_pct for s in all_stats.values() if s.ts_pct > 0]
-    all_ws = [s.ws for s in all_stats.values()]
-    all_ws48 = [s.ws_48 for s in all_stats.values() if s.ws_48 > 0]
-    all_bpm = [s.bpm for s in all_stats.values()]
-    all_vorp = [s.vorp for s in all_stats.values()]
-    all_usg = [s.usg_pct for s in all_stats.values() if s.usg_pct > 0]
-    all_obpm = [s.obpm for s in all_stats.values()]
-    all_dbpm = [s.dbpm for s in all_stats.values()]
-    all_tov_pct = [s.tov_pct for s in all_stats.values() if s.tov_pct > 0]
+    # Percentiles are against all players
+    league = get_advanced_columns(season)
     
     return {
         "per": player_stats.per,
@@ -577,17 +601,17 @@ def get_advanced_stats_with_percentiles(
         "games": player_stats.games,
         "minutes": player_stats.minutes,
         # Percentiles
-        "per_pctl": calculate_percentile(player_stats.per, all_per),
-        "ts_pctl": calculate_percentile(player_stats.ts_pct, all_ts),
-        "ws_pctl": calculate_percentile(player_stats.ws, all_ws),
-        "ws_48_pctl": calculate_percentile(player_stats.ws_48, all_ws48),
-        "bpm_pctl": calculate_percentile(player_stats.bpm, all_bpm),
-        "vorp_pctl": calculate_percentile(player_stats.vorp, all_vorp),
-        "usg_pctl": calculate_percentile(player_stats.usg_pct, all_usg),
-        "obpm_pctl": calculate_percentile(player_stats.obpm, all_obpm),
-        "dbpm_pctl": calculate_percentile(player_stats.dbpm, all_dbpm),
+        "per_pctl": percentile_in_sorted(player_stats.per, league["per"]),
+        "ts_pctl": percentile_in_sorted(player_stats.ts_pct, league["ts_pct"]),
+        "ws_pctl": percentile_in_sorted(player_stats.ws, league["ws"]),
+        "ws_48_pctl": percentile_in_sorted(player_stats.ws_48, league["ws_48"]),
+        "bpm_pctl": percentile_in_sorted(player_stats.bpm, league["bpm"]),
+        "vorp_pctl": percentile_in_sorted(player_stats.vorp, league["vorp"]),
+        "usg_pctl": percentile_in_sorted(player_stats.usg_pct, league["usg_pct"]),
+        "obpm_pctl": percentile_in_sorted(player_stats.obpm, league["obpm"]),
+        "dbpm_pctl": percentile_in_sorted(player_stats.dbpm, league["dbpm"]),
         # Lower TOV% is better
-        "tov_pct_pctl": 100 - calculate_percentile(player_stats.tov_pct, all_tov_pct),
+        "tov_pct_pctl": 100 - percentile_in_sorted(player_stats.tov_pct, league["tov_pct"]),
     }
 
 